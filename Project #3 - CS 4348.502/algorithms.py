@@ -1,9 +1,12 @@
-# python imports
-from queue import Queue, PriorityQueue
 # class imports
-from scheduler import Scheduler
+from scheduler import Scheduler, IllegalArgumentError
 from process import Process
 from event import Event
+from burst_predictor import BurstPredictor
+from ready_queue import DequeReadyQueue, HeapReadyQueue, BucketedReadyQueue, ResponseRatioReadyQueue, KeyedReadyQueue
+
+# weight of a nice 0 process in Linux, a process of this weight gains virtual runtime at the rate of the clock
+NICE_0_WEIGHT = 1024
 
 # THE SCHEDULING ALGORITHM CLASSES BELOW EXTEND THE SCHEDULER BASE CLASS BASED ON THEIR NEEDS
 
@@ -11,7 +14,7 @@ from event import Event
 class SchedulerFCFS(Scheduler):
     # FCFS does not have any options
     def __init__(self, algorithm, event_queue, options):
-        readyQueue = Queue()
+        readyQueue = DequeReadyQueue()
         super().__init__(algorithm, event_queue, options, readyQueue)
     
     def schedule(self, current_time: int):
@@ -19,15 +22,13 @@ class SchedulerFCFS(Scheduler):
         if self.isCPUIdle and not self.readyQueue.empty():
             # unpack the tuple values
             current_process, entered_time = self.readyQueue.get()
+            self.recordDispatch(current_process, current_time)
             # if it is the first time the process gains the control of CPU, set its start time
             if current_process.firstCPUAccess:
                 current_process.stats.start_time = current_time
                 current_process.setFirstCPUAccess(False)
             # calculate the response time for the process
-            response_time = current_time - entered_time
-            # response_time is 0 means the process did not wait for CPU
-            if response_time != 0:
-                current_process.stats.response_times.append(response_time)
+            self.recordResponseTime(current_process, current_time - entered_time)
             # get the duration of the CPU activity that is scheduled to run for completion
             duration = current_process.activities[-1]
             # remove the activity
@@ -44,33 +45,14 @@ class SchedulerFCFS(Scheduler):
 
 # Decision Mode: Preemptive (at time quantum)
 class SchedulerVRR(Scheduler):
+    keepsTimeSlices = True
+
     def __init__(self, algorithm, event_queue, options):
-        readyQueue = Queue()
+        readyQueue = DequeReadyQueue()
         # Auxilary Queue
-        self.auxQueue = Queue()
+        self.auxQueue = DequeReadyQueue()
         super().__init__(algorithm, event_queue, options, readyQueue)
 
-    def handleEvent(self, clock, event: Event):
-        if(event.type == "ARRIVE"):
-            self.handleArrivalEvent(clock, event)
-        elif(event.type == "BLOCK"):
-            self.handleBlockEvent(clock, event)
-        elif(event.type == "UNBLOCK"):
-            self.handleUnblockEvent(clock, event)
-        elif(event.type == "TIMEOUT"):
-            self.handleTimeoutEvent(clock, event)
-        else:
-            self.handleExitEvent(clock, event)
-    
-    def handleTimeoutEvent(self, clock, event: Event):
-        # get the process whose CPU activity is executed until preemption
-        current_process = event.process
-        # add the activity whose just timed out back to the ready queue along with the time entered as tuple
-        self.readyQueue.put((current_process, clock))
-        # CPU now is avaiable for other activities
-        self.isCPUIdle = True
-        self.schedule(clock)
-    
     def handleUnblockEvent(self, clock, event: Event):
         # get the process whose I/O activity is executed for completion
         current_process = event.process
@@ -95,15 +77,13 @@ class SchedulerVRR(Scheduler):
                 return 
             # unpack the tuple values
             (current_process, entered_time), fromAuxilaryQueue = result
+            self.recordDispatch(current_process, current_time)
             # if it is the first time the process gains the control of CPU, set its start time
             if current_process.firstCPUAccess:
                 current_process.stats.start_time = current_time
                 current_process.setFirstCPUAccess(False)
             # calculate the response time for the process
-            response_time = current_time - entered_time
-            # response_time is 0 means the process did not wait for CPU
-            if response_time != 0:
-                current_process.stats.response_times.append(response_time)
+            self.recordResponseTime(current_process, current_time - entered_time)
             # get the duration of the CPU activity that is scheduled to run now
             duration = current_process.activities[-1]
             # update the quantum value if the process is dispatched from the aux queue, otherwise do nothing
@@ -132,6 +112,25 @@ class SchedulerVRR(Scheduler):
             # set isCPUIdle to false
             self.isCPUIdle = False
         
+    def readyQueueLength(self):
+        return len(self.readyQueue) + len(self.auxQueue)
+
+    # processes waiting in the aux queue are I/O bound and cheap to keep, so other cores take from the ready queue first
+    def takeReadyEntry(self, clock):
+        if not self.readyQueue.empty():
+            return self.readyQueue.get(), False
+        return self.auxQueue.get(), True
+
+    def putReadyEntry(self, entry):
+        item, fromAuxilaryQueue = entry
+        if fromAuxilaryQueue:
+            self.auxQueue.put(item)
+        else:
+            self.readyQueue.put(item)
+
+    def drainReadyQueue(self):
+        return self.auxQueue.drain() + self.readyQueue.drain()
+
     def _getProcessFromProperQueue(self):
         if not self.auxQueue.empty():
             return self.auxQueue.get(), True
@@ -143,35 +142,30 @@ class SchedulerVRR(Scheduler):
 # Decision Mode: Preemptive (at arrival)
 class SchedulerSRT(Scheduler):
     def __init__(self, algorithm, event_queue, options):
-        readyQueue = PriorityQueue()
+        readyQueue = HeapReadyQueue()
         super().__init__(algorithm, event_queue, options, readyQueue)
+        # burst length estimates, only needed when the service time is not given
+        self.predictor = BurstPredictor(self.options['alpha'])
+        # the time the running process was dispatched and its remaining time at that moment
+        self.dispatch_time = 0
+        self.running_remaining_time = 0
+        # set once a TIMEOUT is scheduled for the running process so it is not preempted twice
+        self.preemption_pending = False
 
-    def handleEvent(self, clock, event: Event):
-        if(event.type == "ARRIVE"):
-            self.handleArrivalEvent(clock, event)
-        elif(event.type == "BLOCK"):
-            self.handleBlockEvent(clock, event)
-        elif(event.type == "UNBLOCK"):
-            self.handleUnblockEvent(clock, event)
-        elif(event.type == "TIMEOUT"):
-            self.handleTimeoutEvent(clock, event)
-        else:
-            self.handleExitEvent(clock, event)
-  
     def handleArrivalEvent(self, clock, event: Event):
-        # add the admitted process to the ready queue along with the time entered as tuple
-        self.readyQueue.put(PqElementStr(event.process, clock, self.options['service_given'], self.options['alpha']))
+        # add the admitted process to the ready queue
+        element = PqElementStr(event.process, clock, self.options['service_given'], self.predictor)
+        self.readyQueue.put(element)
+        self._preemptIfShorter(clock, element)
         self.schedule(clock)
     
     def handleBlockEvent(self, clock, event: Event):
         # get the process whose CPU activity is executed for completion
         current_process = event.process
-        # get the duration of the I/O activity
-        io_duration = current_process.activities[-1]
-        # remove the activity
-        current_process.activities.pop()
-        # create an unblock event
-        self.eventQueue.push(Event("UNBLOCK", current_process, clock + io_duration))
+        # remove the CPU activity, it stays on the list while running so a preemption can shorten it
+        self._completeCPUActivity(clock, current_process)
+        # start the I/O activity
+        self.startIO(current_process, clock)
         # now CPU is avaiable for other activities
         self.isCPUIdle = True
         self.schedule(clock) 
@@ -181,18 +175,19 @@ class SchedulerSRT(Scheduler):
         current_process = event.process
         # remove the activity
         current_process.activities.pop()
-        # add the unblocked process to the ready queue along with the time entered as tuple
-        self.readyQueue.put(PqElementStr(current_process, clock, self.options['service_given'], self.options['alpha']))
-        # remove the comp
+        # add the unblocked process to the ready queue
+        element = PqElementStr(current_process, clock, self.options['service_given'], self.predictor)
+        self.readyQueue.put(element)
+        self._preemptIfShorter(clock, element)
         self.schedule(clock)  
 
     def handleExitEvent(self, clock, event: Event):
         # get the activity that just ran for completion
         current_process = event.process
         # remove the activity
-        current_process.activities.pop()
+        self._completeCPUActivity(clock, current_process)
         # update the finish time of the process that is ready to be terminated
-        current_process.stats.finish_time = clock 
+        self.recordFinish(current_process, clock)
         # now CPU is avaiable for other activities
         self.isCPUIdle = True
         self.schedule(clock)
@@ -200,32 +195,97 @@ class SchedulerSRT(Scheduler):
     def handleTimeoutEvent(self, clock,  event: Event):
         # get the process whose CPU activity is executed until preemption
         current_process = event.process
-        # add the activity whose just timed out back to the ready queue along with the time entered as tuple
-        self.readyQueue.put(PqElementStr(current_process, clock, self.options['service_given'], self.options['alpha']))
+        # shorten the CPU activity by the time it ran since it was dispatched
+        ran = clock - self.dispatch_time
+        current_process.activities[-1] -= ran
+        current_process.execution_time_so_far += ran
+        self.current_running_process = None
+        self.preemption_pending = False
+        # add the preempted process back to the ready queue
+        self.readyQueue.put(PqElementStr(current_process, clock, self.options['service_given'], self.predictor))
         # CPU now is avaiable for other activities
         self.isCPUIdle = True
         self.schedule(clock)
 
-    def schedule(self, current_time: int):
-        # check whether there is an element in the ready queue whose remaining excecution time is less than the current running process 
-        
+    def shareStateWith(self, other):
+        super().shareStateWith(other)
+        # the burst estimates follow the process from core to core
+        self.predictor = other.predictor
+
+    def drainReadyQueue(self):
+        return [(element.process, element.time_entered) for element in self.readyQueue.drain()]
 
+    # the CPU activity of the running process stays on its list, so it is shortened by the time the process ran
+    def releaseRunning(self, clock):
+        if self.isCPUIdle:
+            return None
+        current_process = self.current_running_process
+        event = self.eventQueue.remove(current_process.pid)
+        ran = clock - self.dispatch_time
+        current_process.activities[-1] -= ran
+        current_process.execution_time_so_far += ran
+        self.current_running_process = None
+        self.preemption_pending = False
+        self.isCPUIdle = True
+        return current_process, event
+
+    # a pending BLOCK/EXIT stays with the CPU activity on the list, a process at the end of a time slice competes in the ready queue
+    def resumeRunning(self, process, event, clock):
+        if event.type == "TIMEOUT":
+            return False
+        self.eventQueue.push(Event(event.type, process, event.time))
+        self.continueRun(process, clock)
+        self.dispatch_time = clock
+        self.running_remaining_time = PqElementStr(process, clock, self.options['service_given'], self.predictor).remaining_time
+        self.preemption_pending = False
+        return True
+
+    def enqueue(self, process, entered_time):
+        self.readyQueue.put(PqElementStr(process, entered_time, self.options['service_given'], self.predictor))
+
+    # Time left for the running process of this core, a core that is idle or about to be preempted is always the best target
+    def getRunningRemainingTime(self, clock):
+        if self.current_running_process is None or self.preemption_pending:
+            return float("inf")
+        return self.running_remaining_time - (clock - self.dispatch_time)
+
+    def _completeCPUActivity(self, clock, current_process):
+        current_process.execution_time_so_far += clock - self.dispatch_time
+        current_process.activities.pop()
+        if not self.options['service_given']:
+            self.predictor.completeBurst(current_process)
+        self.current_running_process = None
+
+    # Preempt the running process when the process that just became ready has a shorter remaining time
+    def _preemptIfShorter(self, clock, element):
+        if self.current_running_process is None or self.preemption_pending:
+            return
+        # a process whose BLOCK/EXIT event is due now has finished its CPU activity, there is nothing left to preempt
+        if self.current_running_process.activities[-1] == clock - self.dispatch_time:
+            return
+        if element.remaining_time < self.getRunningRemainingTime(clock):
+            # cancel the pending BLOCK/EXIT event of the running process through its event handle
+            self.eventQueue.remove(self.current_running_process.pid)
+            # the TIMEOUT is handled after every ARRIVE/UNBLOCK of this instant, so all of them compete for the CPU
+            self.eventQueue.push(Event("TIMEOUT", self.current_running_process, clock))
+            self.preemption_pending = True
+
+    def schedule(self, current_time: int):
         # dispatch the process if possible
         if self.isCPUIdle and not self.readyQueue.empty():
             current = self.readyQueue.get()
-            print("Dispatch")
+            self.recordDispatch(current.process, current_time)
             # if it is the first time the process gains the control of CPU, set its start time
             if current.process.firstCPUAccess:
                 current.process.stats.start_time = current_time
                 current.process.setFirstCPUAccess(False)
 
-            # store the current running process
+            # store the current running process, needed to decide on preemption
             self.current_running_process = current.process
+            self.dispatch_time = current_time
+            self.running_remaining_time = current.remaining_time
             # calculate the response time for the process
-            response_time = current_time - current.time_entered
-            # response_time is 0 means the process did not wait for CPU
-            if response_time != 0:
-                current.process.stats.response_times.append(response_time)
+            self.recordResponseTime(current.process, current_time - current.time_entered)
             # get the duration of the CPU activity that is scheduled to run for completion
             duration = current.process.activities[-1]
             # create a new event
@@ -241,14 +301,35 @@ class SchedulerSRT(Scheduler):
 # Decision Mode: Nonpreemptive   
 class SchedulerHRRN(Scheduler):
     def __init__(self, algorithm, event_queue, options):
-        self.unsorted_processes = []
-        # the queue needs to be a priority queue, not a simple queue
-        readyQueue = PriorityQueue()
+        # ready processes, each one wrapped in a PqElementHrrn
+        # response ratios change with the clock, so the selection is a single pass over the queue instead of a heap
+        readyQueue = ResponseRatioReadyQueue()
         super().__init__(algorithm, event_queue, options, readyQueue)
+        # burst length estimates, only needed when the service time is not given
+        self.predictor = BurstPredictor(self.options['alpha'])
+
+    def _addReadyProcess(self, process, clock):
+        self.readyQueue.put(PqElementHrrn(process, clock, self.options['service_given'], self.predictor))
+
+    # another core takes the process this core would have dispatched next
+    def takeReadyEntry(self, clock):
+        return self.readyQueue.get(clock)
+
+    def drainReadyQueue(self):
+        return [(element.process, element.time_entered) for element in self.readyQueue.drain()]
+
+    def enqueue(self, process, entered_time):
+        self._addReadyProcess(process, entered_time)
+
+    def shareStateWith(self, other):
+        super().shareStateWith(other)
+        # the burst estimates follow the process from core to core
+        self.predictor = other.predictor
+
     
     def handleArrivalEvent(self, clock, event: Event):
-        # add the admitted process to the list containing the process to be scheduled along with the time entered as tuple
-        self.unsorted_processes.append((event.process, clock))
+        # add the admitted process to the list containing the process to be scheduled
+        self._addReadyProcess(event.process, clock)
         self.schedule(clock)
 
     def handleUnblockEvent(self, clock, event: Event):
@@ -256,41 +337,52 @@ class SchedulerHRRN(Scheduler):
         current_process = event.process
         # remove the activity
         current_process.activities.pop()
-        # add the unblocked process to the list containing the process to be scheduled along with the time entered as tuple
-        self.unsorted_processes.append((current_process, clock))
+        # add the unblocked process to the list containing the process to be scheduled
+        self._addReadyProcess(current_process, clock)
         # remove the comp
         self.schedule(clock)
 
+    def handleBlockEvent(self, clock, event: Event):
+        self._completeCPUActivity(event.process)
+        super().handleBlockEvent(clock, event)
+
+    def handleExitEvent(self, clock, event: Event):
+        self._completeCPUActivity(event.process)
+        super().handleExitEvent(clock, event)
+
+    def resumeRunning(self, process, event, clock):
+        if not self.options['service_given']:
+            # the estimate of a process new to the predictor starts from its CPU activity, which is still on the list
+            self.predictor.getEstimate(process)
+        # the CPU activity runs to completion, so it counts as executed as it does when a process is dispatched
+        duration = process.activities[-1]
+        super().resumeRunning(process, event, clock)
+        process.execution_time_so_far += duration
+        return True
+
+    def _completeCPUActivity(self, current_process):
+        # the CPU burst that just finished updates the estimate of the next one
+        if not self.options['service_given']:
+            self.predictor.completeBurst(current_process)
+
     def schedule(self, current_time: int):
         # dispatch the process if possible
-        if self.isCPUIdle and self.unsorted_processes != []:
-            # prepare the processes before scheduling
-            for item in self.unsorted_processes:
-                current_process, time_entered = item
-                response_time = current_time - time_entered
-                # used to calculate response ratio, we'll be removed from a process's response times list after calculation
-                current_process.stats.response_times.append(response_time if response_time != 0 else 0)
-                # add a new entry to the ready queue
-                self.readyQueue.put(PqElementHrrn(current_process, time_entered, self.options['service_given'], self.options['alpha']))
-                current_process.stats.response_times.pop()
-        
-            # unpack the tuple 
-            current = self.readyQueue.get()
-            # remove the current process from the unsorted process list
-            self.unsorted_processes.remove((current.process, current.time_entered))
+        if self.isCPUIdle and not self.readyQueue.empty():
+            # remove the process with the highest response ratio from the ready queue, ties go to the process that entered first
+            current = self.readyQueue.get(current_time)
+            self.recordDispatch(current.process, current_time)
             # if it is the first time the process gains the control of CPU, set its start time
             if current.process.firstCPUAccess:
                 current.process.stats.start_time = current_time
                 current.process.setFirstCPUAccess(False)
             # calculate the response time for the process
-            response_time = current_time - current.time_entered
-            # response_time is 0 means the process did not wait for CPU
-            if response_time != 0:
-                current.process.stats.response_times.append(response_time)
+            self.recordResponseTime(current.process, current_time - current.time_entered)
             # get the duration of the CPU activity that is scheduled to run for completion
             duration = current.process.activities[-1]
             # remove the activity
             current.process.activities.pop()
+            # HRRN is nonpreemptive, so the whole CPU activity is executed once dispatched
+            current.process.execution_time_so_far += duration
             # create a new event
             if len(current.process.activities) > 1:
                 newEvent = Event("BLOCK", current.process, current_time + duration)
@@ -300,36 +392,26 @@ class SchedulerHRRN(Scheduler):
             self.eventQueue.push(newEvent)
             # set isCPUIdle to false
             self.isCPUIdle = False
-    
-        # reset the queue for the next call
-        self.readyQueue = PriorityQueue()
 
 # Decision Mode: Preemptive (at time quantum)
 class SchedulerFeedBack(Scheduler):
+    keepsTimeSlices = True
+
     def __init__(self, algotihm, event_queue, options):
         super().__init__(algotihm, event_queue, options)
         # define any other things that are special to the algorithm 
         num_queues = self.options['num_priorities']
-        self.readyQueues = []
-        # create multiple queues
-        for i in range(0, num_queues, 1):
-            self.readyQueues.append(Queue())
-
-    def handleEvent(self, clock, event: Event):
-        if(event.type == "ARRIVE"):
-            self.handleArrivalEvent(clock, event)
-        elif(event.type == "BLOCK"):
-            self.handleBlockEvent(clock, event)
-        elif(event.type == "UNBLOCK"):
-            self.handleUnblockEvent(clock, event)
-        elif(event.type == "TIMEOUT"):
-            self.handleTimeoutEvent(clock, event)
-        else:
-            self.handleExitEvent(clock, event)
-    
+        # every priority level runs with its own quantum, a single quantum applies to every level
+        quantum = self.options['quantum']
+        self.quanta = quantum if isinstance(quantum, list) else [quantum] * num_queues
+        if len(self.quanta) != num_queues:
+            raise IllegalArgumentError("Quantum must give one value or one per priority level. Aborting...")
+        # one bucket per priority level, the highest priority ready process is found through the queue's bitmap without scanning the levels
+        self.readyQueue = BucketedReadyQueue(num_queues)
+
     def handleArrivalEvent(self, clock, event: Event):
         # add the admitted process to the highest priority queue along with the time entered as tuple
-        self.readyQueues[0].put((event.process, clock))
+        self.readyQueue.put(((event.process, clock), 0))
         self.schedule(clock)
 
     def handleUnblockEvent(self, clock, event: Event):
@@ -340,7 +422,7 @@ class SchedulerFeedBack(Scheduler):
         # find which queue the current process was dispached from before blocking for I/O 
         priority = current_process.lastDispatchedFrom
         # add the unblocked process back to the queue with the same priority as it was previously dispatched from along with the time entered as tuple
-        self.readyQueues[priority].put((current_process, clock))
+        self.readyQueue.put(((current_process, clock), priority))
         # remove the comp
         self.schedule(clock)
 
@@ -350,28 +432,28 @@ class SchedulerFeedBack(Scheduler):
         # find which queue the current process was dispached from before blocking for I/O 
         priority = current_process.lastDispatchedFrom
         # check whether the priority is at the lowest level 
-        if priority == len(self.readyQueues) - 1:
+        if priority == self.readyQueue.getNumBuckets() - 1:
             # add the unblocked process back to the queue with the same priority as it was previously dispatched from along with the time entered as tuple
-            self.readyQueues[priority].put((current_process, clock))
+            self.readyQueue.put(((current_process, clock), priority))
         else:
             # add the unblocked process back to the queue with lower priority than the one it was previously dispatched from along with the time entered as tuple
-             self.readyQueues[priority + 1].put((current_process, clock))
+            self.readyQueue.put(((current_process, clock), priority + 1))
         # CPU now is avaiable for other activities
         self.isCPUIdle = True
         self.schedule(clock)
     
     def schedule(self, current_time: int):
-        quantum = self.options["quantum"]
         # dispatch the process if possible
         if self.isCPUIdle:
             # get the process from one of the queues
             # the queue at index 0 has priority over the queue at index 1, index 1 > index 2, and so on.
-            result = self._getProcessFromProperQueue()
             # both all the queues are empty
-            if result == None:
+            if self.readyQueue.empty():
                 return 
             # unpack the tuple values
-            (current_process, entered_time), priority = result
+            (current_process, entered_time), priority = self.readyQueue.get()
+            quantum = self.quanta[priority]
+            self.recordDispatch(current_process, current_time)
             # if it is the first time the process gains the control of CPU, set its start time
             if current_process.firstCPUAccess:
                 current_process.stats.start_time = current_time
@@ -379,10 +461,7 @@ class SchedulerFeedBack(Scheduler):
             # set which queue the current process is dispatched from
             current_process.lastDispatchedFrom = priority
             # calculate the response time for the process
-            response_time = current_time - entered_time
-            # response_time is 0 means the process did not wait for CPU
-            if response_time != 0:
-                current_process.stats.response_times.append(response_time)
+            self.recordResponseTime(current_process, current_time - entered_time)
             # get the duration of the CPU activity that is scheduled to run now
             duration = current_process.activities[-1]
             # non-negative value indicates that the entire activity can run to completion w/o getting 
@@ -405,53 +484,208 @@ class SchedulerFeedBack(Scheduler):
             self.eventQueue.push(newEvent)
             # set isCPUIdle to false
             self.isCPUIdle = False
-        
-    def _getProcessFromProperQueue(self):
-        for i in range(0, len(self.readyQueues), 1):
-            if not self.readyQueues[i].empty():
-                # return the item from the selected queue along with its priority as integer
-                return self.readyQueues[i].get(), i 
 
-        # if every queue is empty, return nothing
-        return None
+    # other cores take from the lowest priority queue first, those processes have already used the most CPU time
+    def takeReadyEntry(self, clock):
+        return self.readyQueue.getLast()
 
+    # a waiting process keeps the level it waits at, it may have been moved down a level since it was last dispatched
+    def drainReadyQueue(self):
+        released = []
+        for (process, entered_time), priority in self.readyQueue.drain():
+            # overwritten when the process is dispatched again, so the level it waits at takes its place until then
+            process.lastDispatchedFrom = priority
+            released.append((process, entered_time))
+        return released
+
+    def adoptProcess(self, process):
+        super().adoptProcess(process)
+        # a process coming from a feedback scheduler with more priority levels continues at the lowest level of this one
+        process.lastDispatchedFrom = min(process.lastDispatchedFrom, self.readyQueue.getNumBuckets() - 1)
+
+    # processes released by another scheduler keep the priority they were last dispatched from
+    def enqueue(self, process, entered_time):
+        self.readyQueue.put(((process, entered_time), process.lastDispatchedFrom))
+
+# Decision Mode: Preemptive (at the end of the time slice)
+# Completely fair scheduling as in Linux: every process gains virtual runtime while it runs, at a rate inversely proportional to its weight,
+# and the ready process with the least virtual runtime runs next. Within every target_latency (stretched to min_granularity per process
+# once too many are runnable) each runnable process gets a time slice proportional to its weight, but never less than min_granularity.
+# The ready processes are kept ordered by virtual runtime, so a dispatch takes O(log n) however many are waiting.
+class SchedulerCFS(Scheduler):
+    keepsTimeSlices = True
+
+    def __init__(self, algorithm, event_queue, options):
+        readyQueue = KeyedReadyQueue()
+        super().__init__(algorithm, event_queue, options, readyQueue)
+        # the weight of process pid is weights[pid % len(weights)]
+        self.weights = self.options["weights"]
+        # lower bound of the virtual runtime of the ready processes, a process that just arrived or woke up starts from there
+        self.min_vruntime = 0
+        # sum of the weights of the ready processes
+        self.ready_weight = 0
+        self.dispatch_time = 0
+
+    def _getWeight(self, process):
+        return self.weights[process.pid % len(self.weights)]
+
+    # Add a process to the ready queue at the given virtual runtime
+    def _addReadyProcess(self, process, entered_time, vruntime):
+        process.vruntime = vruntime
+        self.readyQueue.put(((process, entered_time), vruntime))
+        self.ready_weight += self._getWeight(process)
+
+    # Charge the running process for the CPU time it received since it was dispatched
+    def _chargeRunTime(self, process, clock):
+        process.vruntime += (clock - self.dispatch_time) * NICE_0_WEIGHT / self._getWeight(process)
+
+    # Time slice of a process of the given weight that is about to run, the running process counts towards the runnable ones
+    def _getTimeSlice(self, weight):
+        min_granularity = self.options["min_granularity"]
+        period = max(self.options["target_latency"], (len(self.readyQueue) + 1) * min_granularity)
+        return max(min_granularity, period * weight // (self.ready_weight + weight))
+
+    def handleArrivalEvent(self, clock, event: Event):
+        # a new process starts at the virtual runtime of the ready processes instead of running until it catches up with them
+        self._addReadyProcess(event.process, clock, max(event.process.vruntime, self.min_vruntime))
+        self.schedule(clock)
+
+    def handleUnblockEvent(self, clock, event: Event):
+        # get the process whose I/O activity is executed for completion
+        current_process = event.process
+        # remove the activity
+        current_process.activities.pop()
+        # a process that slept gets up to half a target latency of credit, so an I/O bound process runs soon without starving the others
+        vruntime = max(current_process.vruntime, self.min_vruntime - self.options["target_latency"] / 2)
+        self._addReadyProcess(current_process, clock, vruntime)
+        self.schedule(clock)
+
+    def handleBlockEvent(self, clock, event: Event):
+        self._chargeRunTime(event.process, clock)
+        super().handleBlockEvent(clock, event)
+
+    def handleExitEvent(self, clock, event: Event):
+        self._chargeRunTime(event.process, clock)
+        super().handleExitEvent(clock, event)
+
+    def handleTimeoutEvent(self, clock, event: Event):
+        # get the process whose time slice is used up
+        current_process = event.process
+        self._chargeRunTime(current_process, clock)
+        # it waits for the CPU again with the virtual runtime it has gained
+        self._addReadyProcess(current_process, clock, current_process.vruntime)
+        # CPU now is avaiable for other activities
+        self.isCPUIdle = True
+        self.schedule(clock)
+
+    def schedule(self, current_time: int):
+        # dispatch the process if possible
+        if self.isCPUIdle and not self.readyQueue.empty():
+            # the ready process with the least virtual runtime, ties go to the process that entered first
+            (current_process, entered_time), vruntime = self.readyQueue.get()
+            weight = self._getWeight(current_process)
+            self.ready_weight -= weight
+            # every other ready process has at least this virtual runtime
+            self.min_vruntime = max(self.min_vruntime, vruntime)
+            self.recordDispatch(current_process, current_time)
+            # if it is the first time the process gains the control of CPU, set its start time
+            if current_process.firstCPUAccess:
+                current_process.stats.start_time = current_time
+                current_process.setFirstCPUAccess(False)
+            # calculate the response time for the process
+            self.recordResponseTime(current_process, current_time - entered_time)
+            self.dispatch_time = current_time
+            time_slice = self._getTimeSlice(weight)
+            # get the duration of the CPU activity that is scheduled to run now
+            duration = current_process.activities[-1]
+            if duration <= time_slice:
+                # remove the activity
+                current_process.activities.pop()
+                if len(current_process.activities) > 1:
+                    # create a BLOCK event
+                    newEvent = Event("BLOCK", current_process, current_time + duration)
+                else:
+                    # create an EXIT event
+                    newEvent = Event("EXIT", current_process, current_time + duration)
+            else:
+                # update duration of the CPU activity that is scheduled to run now
+                current_process.activities[-1] -= time_slice
+                # create a TIMEOUT event
+                newEvent = Event("TIMEOUT", current_process, current_time + time_slice)
+
+            self.eventQueue.push(newEvent)
+            # set isCPUIdle to false
+            self.isCPUIdle = False
+
+    # the virtual runtime of a process taken by another core is made relative to this core, then to the other core in putReadyEntry
+    def takeReadyEntry(self, clock):
+        (process, entered_time), vruntime = self.readyQueue.get()
+        self.ready_weight -= self._getWeight(process)
+        return (process, entered_time), vruntime - self.min_vruntime
+
+    def putReadyEntry(self, entry):
+        (process, entered_time), relative_vruntime = entry
+        self._addReadyProcess(process, entered_time, self.min_vruntime + relative_vruntime)
+
+    def drainReadyQueue(self):
+        self.ready_weight = 0
+        return [item for item, vruntime in self.readyQueue.drain()]
+
+    # the released process is charged for the part of its time slice it ran
+    def releaseRunning(self, clock):
+        if not self.isCPUIdle:
+            self._chargeRunTime(self.current_running_process, clock)
+        return super().releaseRunning(clock)
+
+    def resumeRunning(self, process, event, clock):
+        super().resumeRunning(process, event, clock)
+        # the rest of the run is charged from now
+        self.dispatch_time = clock
+        return True
+
+    # processes released by another scheduler keep the virtual runtime they have, a process new to CFS starts from the ready ones
+    def enqueue(self, process, entered_time):
+        self._addReadyProcess(process, entered_time, max(process.vruntime, self.min_vruntime))
 
 class PqElementStr:
-    def __init__(self, process, entered_time, service_time_given, alpha):
+    def __init__(self, process, entered_time, service_time_given, predictor):
         self.process = process
         self.time_entered = entered_time
         self.service_time_given = service_time_given
-        self.alpha = alpha 
-        if not self.service_time_given:
-            service_time = self.process.stats.getServiceTime()
+        if self.service_time_given:
+            self.remaining_time = self.process.stats.getServiceTime() - self.process.execution_time_so_far
         else:
             # use exponential averaging 
-            pass
-        pass
-        
-        self.remaining_time = service_time - self.process.execution_time_so_far
+            self.remaining_time = predictor.getRemainingTime(self.process)
         
     def __lt__(self, other):
         # use min [s-e]
         return self.remaining_time < other.remaining_time
 
 class PqElementHrrn:
-    def __init__(self, process: Process, time_entered: int, service_time_given, alpha):
+    __slots__ = ("process", "time_entered", "time_spend_waiting", "service_time_given", "service_time", "waiting_plus_service")
+
+    def __init__(self, process: Process, time_entered: int, service_time_given, predictor):
         self.process = process
         self.time_entered = time_entered
+        # time spent waiting before entering the ready queue this time, it does not change while the process is ready
         self.time_spend_waiting = self.process.stats.getTotalWaitTime()
         self.service_time_given = service_time_given
-        # calculate resopnse ratio
         if self.service_time_given:
             service_time = self.process.stats.getServiceTime()
         else:
-            pass
+            # use exponential averaging 
+            service_time = predictor.getEstimate(self.process)
 
-        self.response_ratio = ((self.time_spend_waiting + service_time) / service_time)
+        self.service_time = service_time
+        # w + s without the time spent in the ready queue so far, which is added once the clock is known
+        self.waiting_plus_service = self.time_spend_waiting + service_time - time_entered
 
-    def __lt__(self, other):
-        # use max [w + s] / s
-        return self.response_ratio > other.response_ratio
+    # calculate response ratio: [w + s] / s, infinite for a service time of 0
+    def getResponseRatio(self, current_time):
+        if self.service_time == 0:
+            return float("inf")
+        return (self.waiting_plus_service + current_time) / self.service_time
     
     def __str__(self):
-        return "Process " + str(self.process.pid) + ", Time Spent Waiting " + str(self.time_spend_waiting) + ", Response Ratio " +  str(self.response_ratio) + ", Service Time Given? " + str(self.service_time_given)
+        return "Process " + str(self.process.pid) + ", Time Spent Waiting " + str(self.time_spend_waiting) + ", Service Time " +  str(self.service_time) + ", Service Time Given? " + str(self.service_time_given)
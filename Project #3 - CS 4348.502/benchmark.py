@@ -0,0 +1,207 @@
+# python imports
+import sys
+import os
+import io
+import json
+import time
+import random
+import argparse
+import resource
+from queue import Queue, PriorityQueue
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+# class imports
+from simulation import Simulation, readSchedulerFile
+from ready_queue import DequeReadyQueue, HeapReadyQueue, BucketedReadyQueue
+
+SAMPLE_RUNS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample-runs")
+# scheduler file of every benchmarked case, the options are the ones the sample runs use
+SCHEDULER_FILES = {"FCFS": "fcfs.sf", "FCFS-fast": "fcfs.sf", "VRR": "vrr.sf", "SRT": "srt.sf", "HRRN": "hrrn.sf", "FEEDBACK": "feedback.sf", "CFS": "cfs.sf"}
+# cases allowed to take the fcfs_engine shortcut, every other case runs through the event queue and the scheduler
+FAST_PATH_CASES = ("FCFS-fast",)
+SIZES = (10**2, 10**3, 10**4, 10**5, 10**6)
+
+# workload shape: 1 to 5 CPU bursts of 1..9 separated by I/O bursts of 1..20
+# the mean service time is 15, so an interarrival time of 0..33 keeps the CPU about 90% busy and the ready queue bounded
+_MAX_INTERARRIVAL = 33
+
+# Generator yielding num_processes (arrival time, activities) pairs sorted by arrival time, the same seed gives the same workload
+def generateWorkload(num_processes, seed = 0):
+    rng = random.Random(seed)
+    arrival = 0
+    for _ in range(num_processes):
+        arrival += rng.randint(0, _MAX_INTERARRIVAL)
+        activities = [rng.randint(1, 9)]
+        for _ in range(rng.randint(0, 4)):
+            activities.append(rng.randint(1, 20))
+            activities.append(rng.randint(1, 9))
+        yield arrival, activities
+
+# Run one case against a generated workload, called in a fresh worker process so the peak RSS belongs to this run only
+def _runCase(case):
+    name, num_processes, seed = case
+    algorithm, options = readSchedulerFile(os.path.join(SAMPLE_RUNS_DIR, SCHEDULER_FILES[name]))
+    # generate the workload up front so that only the simulation itself is timed
+    workload = list(generateWorkload(num_processes, seed))
+    simulation = Simulation.fromConfig(algorithm, options, workload)
+    simulation.useFastFCFS = name in FAST_PATH_CASES
+    start = time.perf_counter()
+    simulation.run()
+    elapsed = time.perf_counter() - start
+    dispatches = simulation.scheduler.dispatchCount
+    return {
+        "algorithm": name,
+        "processes": num_processes,
+        "events": simulation.eventCount,
+        "dispatches": dispatches,
+        "seconds": elapsed,
+        "events_per_sec": simulation.eventCount / elapsed,
+        "us_per_dispatch": elapsed * 1e6 / dispatches,
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+def runCase(algorithm, num_processes, seed = 0):
+    # a spawned worker that runs a single task starts with a clean heap, so ru_maxrss is not inherited from earlier runs
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"), max_tasks_per_child=1) as executor:
+        return executor.submit(_runCase, (algorithm, num_processes, seed)).result()
+
+# The priority levels of the feedback scheduler as it used to keep them: one locking queue per level, scanned from the top on every get
+# the scheduler found out that every level was empty from the same scan, so empty() is only a counter here
+class _QueuePerLevel:
+    def __init__(self, num_levels):
+        self.levels = [Queue() for _ in range(num_levels)]
+        self.size = 0
+
+    def put(self, entry):
+        item, level = entry
+        self.levels[level].put(item)
+        self.size += 1
+
+    def get(self):
+        for level, queue in enumerate(self.levels):
+            if not queue.empty():
+                self.size -= 1
+                return queue.get(), level
+
+    def empty(self):
+        return self.size == 0
+
+# Put n items and take them out again the way a scheduler does, checking empty() before every get, return the nanoseconds per put + get pair
+def _timeQueue(queue, items):
+    start = time.perf_counter_ns()
+    for item in items:
+        queue.put(item)
+    while not queue.empty():
+        queue.get()
+    return (time.perf_counter_ns() - start) / len(items)
+
+# Compare the ready queues the schedulers used to be built on with their ReadyQueue replacements
+def benchmarkReadyQueues(operations = 200000, num_levels = 64, seed = 0):
+    rng = random.Random(seed)
+    fifo_items = list(range(operations))
+    priority_items = [rng.randint(0, 1000) for _ in range(operations)]
+    level_items = [(i, rng.randrange(num_levels)) for i in range(operations)]
+    return [
+        ("FIFO", "queue.Queue", _timeQueue(Queue(), fifo_items), "DequeReadyQueue", _timeQueue(DequeReadyQueue(), fifo_items)),
+        ("Priority", "queue.PriorityQueue", _timeQueue(PriorityQueue(), priority_items), "HeapReadyQueue", _timeQueue(HeapReadyQueue(), priority_items)),
+        ("{} levels".format(num_levels), "Queue per level", _timeQueue(_QueuePerLevel(num_levels), level_items),
+         "BucketedReadyQueue", _timeQueue(BucketedReadyQueue(num_levels), level_items)),
+    ]
+
+def _printReadyQueueRows(rows):
+    print("{:<10} {:<20} {:>10} {:<20} {:>10} {:>8}".format("Queue", "Before", "ns/op", "After", "ns/op", "Speedup"))
+    for kind, before, before_ns, after, after_ns in rows:
+        print("{:<10} {:<20} {:>10.1f} {:<20} {:>10.1f} {:>7.1f}x".format(kind, before, before_ns, after, after_ns, before_ns / after_ns))
+
+# Run every sample run again and return the names of the ones whose text report no longer matches the .out file byte for byte
+def checkSampleRuns():
+    mismatches = []
+    for name, schedFile in SCHEDULER_FILES.items():
+        out = io.StringIO()
+        simulation = Simulation(os.path.join(SAMPLE_RUNS_DIR, schedFile), os.path.join(SAMPLE_RUNS_DIR, "example.pf"))
+        simulation.useFastFCFS = name in FAST_PATH_CASES
+        simulation.start(out=out)
+        with open(os.path.join(SAMPLE_RUNS_DIR, schedFile[:-3] + ".out"), "rb") as f:
+            if out.getvalue().encode() != f.read():
+                mismatches.append(name)
+    return mismatches
+
+# Compare results with a saved baseline, a run regresses when its throughput drops or its peak RSS grows by more than the tolerance
+def findRegressions(results, baseline, tolerance):
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["algorithm"], {}).get(str(result["processes"]))
+        if previous is None:
+            continue
+        if result["events_per_sec"] < previous["events_per_sec"] * (1 - tolerance):
+            regressions.append("{} n={}: {:.0f} events/sec, baseline {:.0f}".format(
+                result["algorithm"], result["processes"], result["events_per_sec"], previous["events_per_sec"]))
+        if result["peak_rss_kib"] > previous["peak_rss_kib"] * (1 + tolerance):
+            regressions.append("{} n={}: peak RSS {} KiB, baseline {} KiB".format(
+                result["algorithm"], result["processes"], result["peak_rss_kib"], previous["peak_rss_kib"]))
+    return regressions
+
+# Baseline file layout: {"FCFS": {"1000": {"events_per_sec": ..., "us_per_dispatch": ..., "peak_rss_kib": ...}}}
+def saveBaseline(path, results):
+    baseline = {}
+    for result in results:
+        baseline.setdefault(result["algorithm"], {})[str(result["processes"])] = {
+            "events_per_sec": result["events_per_sec"],
+            "us_per_dispatch": result["us_per_dispatch"],
+            "peak_rss_kib": result["peak_rss_kib"],
+        }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+def _printRow(result):
+    print("{:<9} {:>8} {:>10} {:>10} {:>9.2f} {:>12.0f} {:>10.2f} {:>10}".format(
+        result["algorithm"], result["processes"], result["events"], result["dispatches"], result["seconds"],
+        result["events_per_sec"], result["us_per_dispatch"], result["peak_rss_kib"]), flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the throughput and memory of every scheduling algorithm as the workload grows")
+    parser.add_argument("--algorithms", nargs="+", choices=list(SCHEDULER_FILES), default=list(SCHEDULER_FILES), help="algorithms to benchmark (default: all)")
+    parser.add_argument("--max-size", type=int, default=SIZES[-1], help="largest number of processes to simulate (default: {})".format(SIZES[-1]))
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated workloads (default: 0)")
+    parser.add_argument("--baseline", help="baseline file to compare the results with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown or memory growth before a run counts as a regression (default: 0.2)")
+    parser.add_argument("--save-baseline", help="write the results to this baseline file")
+    parser.add_argument("--ready-queues", action="store_true", help="only compare the cost of a put + get on the ready queues with the queue module")
+    args = parser.parse_args()
+
+    if args.ready_queues:
+        _printReadyQueueRows(benchmarkReadyQueues(seed=args.seed))
+        return
+
+    failed = False
+    mismatches = checkSampleRuns()
+    for algorithm in mismatches:
+        print("Sample run {} no longer matches its .out file".format(algorithm))
+    failed = failed or bool(mismatches)
+
+    print("{:<9} {:>8} {:>10} {:>10} {:>9} {:>12} {:>10} {:>10}".format(
+        "Algorithm", "Procs", "Events", "Dispatches", "Seconds", "Events/sec", "us/disp", "RSS KiB"))
+    results = []
+    for algorithm in args.algorithms:
+        for num_processes in SIZES:
+            if num_processes > args.max_size:
+                break
+            result = runCase(algorithm, num_processes, args.seed)
+            _printRow(result)
+            results.append(result)
+
+    if args.save_baseline is not None:
+        saveBaseline(args.save_baseline, results)
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            regressions = findRegressions(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print("Regression: " + regression)
+        failed = failed or bool(regressions)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# python imports
+from array import array
+
+# marks a process whose first CPU burst has not been seen yet
+_NO_ESTIMATE = -1.0
+
+# Predicts the length of the next CPU burst of every process with exponential averaging:
+# S[n+1] = alpha * T[n] + (1 - alpha) * S[n], where the first CPU burst is used as S[0]
+class BurstPredictor:
+    def __init__(self, alpha):
+        self.alpha = alpha
+        # both arrays are indexed by pid, pids are handed out in arrival order so they only ever grow at the end
+        # the current burst estimate of every process
+        self.estimates = array('d')
+        # the execution time of every process when its current CPU burst started
+        self.burst_starts = array('Q')
+
+    def _ensureProcess(self, process):
+        pid = process.pid
+        while len(self.estimates) <= pid:
+            self.estimates.append(_NO_ESTIMATE)
+            self.burst_starts.append(0)
+        if self.estimates[pid] == _NO_ESTIMATE:
+            # a process entering the system has its first CPU activity at the end of the activity list
+            self.estimates[pid] = process.activities[-1]
+            self.burst_starts[pid] = process.execution_time_so_far
+
+    # Estimated length of the current CPU burst of the process
+    def getEstimate(self, process):
+        self._ensureProcess(process)
+        return self.estimates[process.pid]
+
+    # Estimated time left in the current CPU burst of the process
+    def getRemainingTime(self, process):
+        self._ensureProcess(process)
+        return self.estimates[process.pid] - (process.execution_time_so_far - self.burst_starts[process.pid])
+
+    # Fold the length of the CPU burst that just completed into the estimate, must be called after execution_time_so_far is updated
+    def completeBurst(self, process):
+        self._ensureProcess(process)
+        pid = process.pid
+        burst = process.execution_time_so_far - self.burst_starts[pid]
+        self.estimates[pid] = self.alpha * burst + (1 - self.alpha) * self.estimates[pid]
+        self.burst_starts[pid] = process.execution_time_so_far
@@ -1,4 +1,7 @@
 # MAGIC METHOD: https://www.tutorialsteacher.com/python/magic-methods-in-python
+import heapq
+from itertools import count
+
 EVENT_TYPE_PRIORITY = {
         "ARRIVE": 0,
         "UNBLOCK": 1,
@@ -26,39 +29,70 @@ class Event:
     def __str__(self):
         return "At time " + str(self.time) + ", " + self.type + " Event for Process " + str(self.process.pid)
 
-# A Priority Queue that sorts Events by '<'
+# index of the event inside a heap entry, an entry whose event is None is a tombstone
+_ENTRY_EVENT = 4
+
+# A binary heap that orders Events by (time, type priority, pid) - the same order '<' defines
 class EventQueue:
     def __init__(self):
+        # heap entries are [time, type_priority, pid, seq, event] lists so the heap compares plain ints only
         self.queue = []
-        self.dirty = False
+        # the sequence number keeps heap entries unique, so the event itself is never compared
+        self.counter = count()
+        # per-process handle to the heap entry of its pending event, used for O(1) cancellation
+        self.handles = {}
+        # number of live (not cancelled) events in the heap
+        self.size = 0
     def push(self,item):
         if type(item) is Event:
-            self.queue.append(item)
-            self.dirty = True
+            pid = item.process.pid
+            entry = [item.time, EVENT_TYPE_PRIORITY[item.type], pid, next(self.counter), item]
+            heapq.heappush(self.queue, entry)
+            self.handles[pid] = entry
+            self.size += 1
         else:
             raise TypeError("Only Events allowed in EventQueue")
     def __prepareLookup(self, operation):
-        if self.queue == []:
+        # discard the cancelled entries sitting on top of the heap
+        queue = self.queue
+        while queue and queue[0][_ENTRY_EVENT] is None:
+            heapq.heappop(queue)
+        if not queue:
             raise LookupError(operation + " on empty EventQueue")
-        if self.dirty:
-            self.queue.sort(reverse=True)
-            self.dirty = False
     def pop(self):
         self.__prepareLookup("Pop")
-        return self.queue.pop()
+        entry = heapq.heappop(self.queue)
+        event = entry[_ENTRY_EVENT]
+        # the popped event is no longer pending, so drop its handle
+        if self.handles.get(entry[2]) is entry:
+            del self.handles[entry[2]]
+        self.size -= 1
+        return event
     # Look at the next event
     def peek(self):
         self.__prepareLookup("Peek")
-        return self.queue[-1]
+        return self.queue[0][_ENTRY_EVENT]
     def empty(self):
-        return len(self.queue) == 0
+        return self.size == 0
+    def __len__(self):
+        return self.size
+    # itertools.count cannot be pickled on every Python version, so a checkpoint stores the next sequence number instead
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["counter"] = next(self.counter)
+        return state
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.counter = count(state["counter"])
     def remove(self, process_id):
-        for event in self.queue:
-            # remove the block/exit event for the process that is preempted during execution
-            if event.process.pid == process_id:
-                self.queue.remove(event)
-                self.dirty = True
-                return
+        # cancel the pending block/exit event of the process that is preempted during execution
+        entry = self.handles.pop(process_id, None)
+        if entry is None:
+            return None
+        event = entry[_ENTRY_EVENT]
+        # leave a tombstone in the heap, it is skipped lazily once it reaches the top
+        entry[_ENTRY_EVENT] = None
+        self.size -= 1
+        return event
     def __str__(self):
-        return "EventQueue(" + str(self.queue) + ")"
-
+        return "EventQueue(" + str([str(entry[_ENTRY_EVENT]) for entry in sorted(self.queue) if entry[_ENTRY_EVENT] is not None]) + ")"
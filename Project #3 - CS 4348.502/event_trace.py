@@ -0,0 +1,120 @@
+# python imports
+import sys
+import struct
+from array import array
+# class imports
+from event import EVENT_TYPE_PRIORITY
+
+# record kinds, the event types keep their tie-break priority as their code
+DISPATCH = 5
+RECORD_KINDS = {priority: etype for etype, priority in EVENT_TYPE_PRIORITY.items()}
+RECORD_KINDS[DISPATCH] = "DISPATCH"
+
+# file header: magic, format version, record size and the number of records a ring buffer dropped
+_MAGIC = b"SCHTRACE"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHQ")
+# one record: time, pid and kind
+_RECORD = struct.Struct("<QIB")
+# size of the buffer collected before it is written to the file
+_FLUSH_BYTES = 1 << 16
+
+# Records events and dispatch decisions into a compact binary trace file.
+# Without a ring size every record is streamed to the file, with a ring size only the last ring_size records are kept and written on close.
+class TraceRecorder:
+    def __init__(self, path, ring_size = None):
+        if ring_size is not None and ring_size <= 0:
+            raise ValueError("Trace ring size must be a positive integer. Aborting...")
+        self.path = path
+        self.ring_size = ring_size
+        self.file = open(path, "wb")
+        if ring_size is None:
+            self.file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, 0))
+            self.buffer = bytearray()
+        else:
+            # preallocated columns of the ring, the oldest record is overwritten once it is full
+            self.times = array('Q', bytes(8 * ring_size))
+            self.pids = array('I', bytes(4 * ring_size))
+            self.kinds = array('B', bytes(ring_size))
+            self.count = 0
+
+    def _record(self, time, kind, pid):
+        if self.ring_size is None:
+            self.buffer += _RECORD.pack(time, pid, kind)
+            if len(self.buffer) >= _FLUSH_BYTES:
+                self.file.write(self.buffer)
+                self.buffer.clear()
+        else:
+            index = self.count % self.ring_size
+            self.times[index] = time
+            self.pids[index] = pid
+            self.kinds[index] = kind
+            self.count += 1
+
+    def recordEvent(self, event):
+        self._record(event.time, EVENT_TYPE_PRIORITY[event.type], event.process.pid)
+
+    def recordDispatch(self, time, pid):
+        self._record(time, DISPATCH, pid)
+
+    def close(self):
+        if self.file is None:
+            return
+        if self.ring_size is None:
+            self.file.write(self.buffer)
+        else:
+            kept = min(self.count, self.ring_size)
+            self.file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, self.count - kept))
+            # the oldest kept record sits right after the newest one once the ring wrapped around
+            start = self.count % self.ring_size if self.count > self.ring_size else 0
+            buffer = bytearray()
+            for i in range(kept):
+                index = (start + i) % self.ring_size
+                buffer += _RECORD.pack(self.times[index], self.pids[index], self.kinds[index])
+            self.file.write(buffer)
+        self.file.close()
+        self.file = None
+
+# Generator yielding the (time, kind, pid) records of a trace file in the order they were recorded
+def readTrace(path):
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError("{} is not a trace file".format(path))
+        magic, version, record_size, _ = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+            raise ValueError("{} is not a version {} trace file".format(path, _VERSION))
+        while True:
+            chunk = f.read(_RECORD.size * 4096)
+            if not chunk:
+                return
+            for time, pid, kind in _RECORD.iter_unpack(chunk):
+                yield time, kind, pid
+
+# Number of records a ring buffer trace dropped before the first record in the file
+def getDroppedCount(path):
+    with open(path, "rb") as f:
+        return _HEADER.unpack(f.read(_HEADER.size))[3]
+
+# Render a trace in the same text format the debug runs print
+def renderTrace(path, out):
+    lines = []
+    for time, kind, pid in readTrace(path):
+        if kind == DISPATCH:
+            lines.append("Dispatch {}\n".format(pid))
+        else:
+            lines.append("At time {}, {} Event for Process {}\n".format(time, RECORD_KINDS[kind], pid))
+        if len(lines) >= 4096:
+            out.write("".join(lines))
+            lines.clear()
+    out.write("".join(lines))
+
+def main():
+    # check to see if the correct # of arguments are passed in to the program as input
+    num_of_args = len(sys.argv)
+    if (num_of_args) != 2:
+        raise TypeError("Invalid number of arguments given. Expected: 2, Received: {}".format(num_of_args))
+    renderTrace(sys.argv[1], sys.stdout)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# python imports
+from heapq import heappush, heappop
+from collections import deque
+from array import array
+# class imports
+from event import EVENT_TYPE_PRIORITY
+
+_UNBLOCK = EVENT_TYPE_PRIORITY["UNBLOCK"]
+_BLOCK = EVENT_TYPE_PRIORITY["BLOCK"]
+_EXIT = EVENT_TYPE_PRIORITY["EXIT"]
+# number of response times collected before they are added to the quantile sketches
+_SKETCH_BATCH = 1 << 16
+
+# Fast path for a whole single core FCFS run with unlimited I/O.
+# FCFS never preempts and a blocked process never waits for a device, so the pending work is one (time, type priority, pid) key
+# per running or blocked process. The keys are kept in a heap of plain tuples instead of Event objects, and the handlers and
+# schedule() of SchedulerFCFS are inlined into one loop. Arrivals are taken from the sorted workload without entering the heap:
+# an ARRIVE comes before every other event type at the same time and arrivals come in pid order, so the next arrival goes first
+# whenever it is not later than the top of the heap. Events are handled in exactly the order of the EventQueue, so every process
+# ends with the same stats as in the event driven run.
+# nextArrival is the first process not admitted yet, readNextArrival returns the one after it or None.
+# Returns the clock at the end of the run and the number of events handled.
+def runFCFS(scheduler, processes, nextArrival, readNextArrival):
+    # the pid keeps the keys unique, so the process in the last slot is never compared
+    heap = []
+    ready = deque()
+    isCPUIdle = True
+    clock = 0
+    events = 0
+    dispatches = 0
+    lastDispatchTime = 0
+    # the sketches are updated in batches, repeated values are placed in their bucket once per batch
+    responseTimes = array('Q')
+    turnaroundTimes = array('Q')
+    arrival_time = nextArrival.stats.arrival_time if nextArrival is not None else None
+    while True:
+        if nextArrival is not None and (not heap or arrival_time <= heap[0][0]):
+            clock = arrival_time
+            processes.append(nextArrival)
+            ready.append((nextArrival, clock))
+            nextArrival = readNextArrival()
+            if nextArrival is not None:
+                arrival_time = nextArrival.stats.arrival_time
+        elif heap:
+            clock, kind, pid, process = heappop(heap)
+            if kind == _UNBLOCK:
+                process.activities.pop()
+                ready.append((process, clock))
+            elif kind == _BLOCK:
+                # unlimited I/O: the I/O activity at the end of the activity list starts right away
+                heappush(heap, (clock + process.activities[-1], _UNBLOCK, pid, process))
+                isCPUIdle = True
+            else:
+                process.stats.finish_time = clock
+                turnaroundTimes.append(clock - process.stats.arrival_time)
+                isCPUIdle = True
+        else:
+            break
+        events += 1
+        # dispatch as schedule() does after every event
+        if isCPUIdle and ready:
+            process, entered_time = ready.popleft()
+            dispatches += 1
+            lastDispatchTime = clock
+            process.lastCore = 0
+            stats = process.stats
+            if process.firstCPUAccess:
+                stats.start_time = clock
+                process.firstCPUAccess = False
+            response_time = clock - entered_time
+            if response_time != 0:
+                stats.addResponseTime(response_time)
+                responseTimes.append(response_time)
+                if len(responseTimes) >= _SKETCH_BATCH:
+                    scheduler.responseTimeSketch.addAll(responseTimes)
+                    del responseTimes[:]
+                    scheduler.turnaroundTimeSketch.addAll(turnaroundTimes)
+                    del turnaroundTimes[:]
+            activities = process.activities
+            duration = activities.pop()
+            heappush(heap, (clock + duration, _BLOCK if len(activities) > 1 else _EXIT, process.pid, process))
+            isCPUIdle = False
+    scheduler.responseTimeSketch.addAll(responseTimes)
+    scheduler.turnaroundTimeSketch.addAll(turnaroundTimes)
+    scheduler.dispatchCount += dispatches
+    scheduler.lastDispatchTime = lastDispatchTime
+    return clock, events
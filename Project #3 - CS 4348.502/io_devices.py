@@ -0,0 +1,135 @@
+# python imports
+import heapq
+from collections import deque
+# class imports
+from event import Event
+
+IO_POLICIES = ("fifo", "sstf")
+
+# An I/O device serves one request at a time, blocked processes wait in its queue until it is free
+class IODevice:
+    def __init__(self, deviceId, policy):
+        self.deviceId = deviceId
+        self.policy = policy
+        self.busy = False
+        self.busy_since = 0
+        self.busy_time = 0
+        # number of requests started and the time they spent waiting for the device
+        self.requests = 0
+        self.wait_time_sum = 0
+        self.max_queue_length = 0
+
+    # to be implemented by the sub classes
+    def queueLength(self):
+        pass
+
+    def put(self, process, clock):
+        pass
+
+    # the (process, time entered) of the request to serve next
+    def get(self):
+        pass
+
+# Decision Mode: requests are served in the order they were made
+class IODeviceFIFO(IODevice):
+    def __init__(self, deviceId):
+        super().__init__(deviceId, "fifo")
+        self.waiting = deque()
+
+    def queueLength(self):
+        return len(self.waiting)
+
+    def put(self, process, clock):
+        self.waiting.append((process, clock))
+
+    def get(self):
+        return self.waiting.popleft()
+
+# Decision Mode: the shortest I/O activity is served first (shortest seek time first style), ties in request order
+class IODeviceSSTF(IODevice):
+    def __init__(self, deviceId):
+        super().__init__(deviceId, "sstf")
+        self.waiting = []
+        # request number, breaks ties between equal I/O activities in request order
+        self.sequence = 0
+
+    def queueLength(self):
+        return len(self.waiting)
+
+    def put(self, process, clock):
+        # the I/O activity the process waits for is at the end of its activity list
+        heapq.heappush(self.waiting, (process.activities[-1], self.sequence, process, clock))
+        self.sequence += 1
+
+    def get(self):
+        _, _, process, entered = heapq.heappop(self.waiting)
+        return process, entered
+
+# A fixed number of I/O devices shared by every process, used in place of unlimited parallel I/O when the io_devices option is given
+# a blocked process takes a free device, or joins the device with the shortest queue when every device is busy
+class IOSubsystem:
+    def __init__(self, eventQueue, num_devices, policies):
+        if num_devices < 1:
+            raise ValueError("Io_devices must be a positive integer. Aborting...")
+        # a single policy applies to every device, otherwise there is one policy per device
+        if len(policies) == 1:
+            policies = policies * num_devices
+        if len(policies) != num_devices:
+            raise ValueError("Io_policy must give one policy or one per device. Aborting...")
+        self.eventQueue = eventQueue
+        self.devices = []
+        for deviceId, policy in enumerate(policies):
+            if policy == "fifo":
+                self.devices.append(IODeviceFIFO(deviceId))
+            elif policy == "sstf":
+                self.devices.append(IODeviceSSTF(deviceId))
+            else:
+                raise ValueError("I/O policy {} not supported. Expected one of: {}. Aborting...".format(policy, ", ".join(IO_POLICIES)))
+
+    # Create the subsystem from the io_devices and io_policy scheduler options, io_policy is a comma separated list
+    @classmethod
+    def fromOptions(cls, eventQueue, num_devices, policy = "fifo"):
+        return cls(eventQueue, int(num_devices), [name.strip() for name in policy.split(",")])
+
+    # A process blocked for the I/O activity at the end of its activity list
+    def request(self, process, clock):
+        device = None
+        for candidate in self.devices:
+            if not candidate.busy:
+                device = candidate
+                break
+        if device is None:
+            device = min(self.devices, key=lambda candidate: candidate.queueLength())
+        process.ioDevice = device.deviceId
+        if device.busy:
+            device.put(process, clock)
+            device.max_queue_length = max(device.max_queue_length, device.queueLength())
+        else:
+            self._start(device, process, clock, clock)
+
+    # The I/O activity of the process is complete, its device serves the next request
+    def complete(self, process, clock):
+        device = self.devices[process.ioDevice]
+        device.busy_time += clock - device.busy_since
+        device.busy = False
+        if device.queueLength() != 0:
+            waiting_process, entered = device.get()
+            self._start(device, waiting_process, entered, clock)
+
+    def _start(self, device, process, entered, clock):
+        wait_time = clock - entered
+        process.stats.addIOWaitTime(wait_time)
+        device.requests += 1
+        device.wait_time_sum += wait_time
+        device.busy = True
+        device.busy_since = clock
+        self.eventQueue.push(Event("UNBLOCK", process, clock + process.activities[-1]))
+
+    # (device id, policy, utilization, requests, mean wait time, max queue length) of every device, utilization is relative to the end of the run
+    def getDeviceStats(self, clock):
+        stats = []
+        for device in self.devices:
+            utilization = device.busy_time / clock if clock else 0.0
+            mean_wait_time = device.wait_time_sum / device.requests if device.requests else 0.0
+            stats.append((device.deviceId, device.policy, utilization, device.requests, mean_wait_time, device.max_queue_length))
+        return stats
@@ -0,0 +1,146 @@
+# python imports
+import sys
+import struct
+
+# file header: magic, format version, record size, window length and number of CPUs
+_MAGIC = b"SCHSMPLS"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHQH")
+# one record per window: start time, length, mean busy CPUs, mean ready queue length, mean blocked processes,
+# max ready queue length, max blocked processes, arrivals and completions
+_RECORD = struct.Struct("<QQdddIIII")
+# size of the buffer collected before it is written to the file
+_FLUSH_BYTES = 1 << 16
+
+SAMPLE_COLUMNS = ("start", "length", "utilization", "mean_ready", "mean_blocked", "max_ready", "max_blocked", "arrivals", "completions")
+
+# Samples the state of a running simulation into fixed length windows of simulated time and streams one record per window to a binary file.
+# The state only changes when events are handled, so the means are exact time weighted averages over each window.
+# Only the current window is kept in memory, however long the run is.
+class MetricsSampler:
+    def __init__(self, path, window, num_cpus = 1):
+        if window <= 0:
+            raise ValueError("Sample window must be a positive integer. Aborting...")
+        self.path = path
+        self.window = window
+        self.num_cpus = num_cpus
+        self.file = open(path, "wb")
+        self.file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, window, num_cpus))
+        self.buffer = bytearray()
+        # the state since the latest observation
+        self.time = 0
+        self.busy = 0
+        self.ready = 0
+        self.blocked = 0
+        # the window being filled
+        self.windowStart = 0
+        self._resetWindow()
+
+    def _resetWindow(self):
+        # time integrals of the state over the window
+        self.busy_sum = 0
+        self.ready_sum = 0
+        self.blocked_sum = 0
+        # the state at the start of the window is part of it
+        self.max_ready = self.ready
+        self.max_blocked = self.blocked
+        self.arrivals = 0
+        self.completions = 0
+
+    def _accumulate(self, duration):
+        self.busy_sum += self.busy * duration
+        self.ready_sum += self.ready * duration
+        self.blocked_sum += self.blocked * duration
+
+    def _writeWindow(self, length):
+        self.buffer += _RECORD.pack(self.windowStart, length, self.busy_sum / length / self.num_cpus, self.ready_sum / length,
+                                    self.blocked_sum / length, self.max_ready, self.max_blocked, self.arrivals, self.completions)
+        if len(self.buffer) >= _FLUSH_BYTES:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+
+    # Move the clock to the given time, writing every window that ends by then, called before the events at that time are handled
+    def advance(self, time):
+        windowEnd = self.windowStart + self.window
+        while time >= windowEnd:
+            self._accumulate(windowEnd - self.time)
+            self.time = windowEnd
+            self._writeWindow(self.window)
+            self.windowStart = windowEnd
+            windowEnd += self.window
+            self._resetWindow()
+        self._accumulate(time - self.time)
+        self.time = time
+
+    # Count an event handled at the current time
+    def countEvent(self, etype):
+        if etype == "BLOCK":
+            self.blocked += 1
+        elif etype == "UNBLOCK":
+            self.blocked -= 1
+        elif etype == "ARRIVE":
+            self.arrivals += 1
+        elif etype == "EXIT":
+            self.completions += 1
+
+    # The state after every event at the current time is handled, it holds until the next advance
+    def observe(self, busy, ready):
+        self.busy = busy
+        self.ready = ready
+        if ready > self.max_ready:
+            self.max_ready = ready
+        if self.blocked > self.max_blocked:
+            self.max_blocked = self.blocked
+
+    # Write the windows up to the end of the run, the last one is cut short at that time
+    def close(self, time):
+        if self.file is None:
+            return
+        self.advance(time)
+        if self.time > self.windowStart:
+            self._writeWindow(self.time - self.windowStart)
+        self.file.write(self.buffer)
+        self.file.close()
+        self.file = None
+
+# Window length and number of CPUs of a sample file
+def readSampleHeader(path):
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+    if len(header) != _HEADER.size:
+        raise ValueError("{} is not a sample file".format(path))
+    magic, version, record_size, window, num_cpus = _HEADER.unpack(header)
+    if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+        raise ValueError("{} is not a version {} sample file".format(path, _VERSION))
+    return window, num_cpus
+
+# Generator yielding one tuple per window of a sample file, in the order of SAMPLE_COLUMNS
+def readSamples(path):
+    readSampleHeader(path)
+    with open(path, "rb") as f:
+        f.seek(_HEADER.size)
+        while True:
+            chunk = f.read(_RECORD.size * 4096)
+            if not chunk:
+                return
+            yield from _RECORD.iter_unpack(chunk)
+
+# Render a sample file as CSV
+def renderSamples(path, out):
+    lines = [",".join(SAMPLE_COLUMNS) + "\n"]
+    for sample in readSamples(path):
+        lines.append(",".join(str(value) for value in sample) + "\n")
+        if len(lines) >= 4096:
+            out.write("".join(lines))
+            lines.clear()
+    out.write("".join(lines))
+
+def main():
+    # check to see if the correct # of arguments are passed in to the program as input
+    num_of_args = len(sys.argv)
+    if (num_of_args) != 2:
+        raise TypeError("Invalid number of arguments given. Expected: 2, Received: {}".format(num_of_args))
+    renderSamples(sys.argv[1], sys.stdout)
+
+if __name__ == "__main__":
+    main()
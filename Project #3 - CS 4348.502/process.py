@@ -1,12 +1,18 @@
+# python imports
+from array import array
 # class imports
 from process_stats import ProcessStats
 
 class Process():
+    # slots keep a process down to a fixed set of fields without a per-instance __dict__
+    __slots__ = ("pid", "activities", "stats", "firstCPUAccess", "lastCPUAccessDuration", "lastDispatchedFrom", "execution_time_so_far", "lastCore", "ioDevice", "vruntime")
+
     # activity is defined as an integer value representing a duration of a CPU or I/O event 
     def __init__(self,pid,arrival_time,activities):
         self.pid = pid
-        # reverse the list so removal of activities from the end of the list will take O(1) time
-        self.activities = activities[::-1]
+        # reverse the activities so removal of activities from the end of the array will take O(1) time
+        # a flat unsigned 64 bit array takes 8 bytes per activity instead of a list slot plus an int object, and holds durations past 2^32
+        self.activities = array('Q', activities[::-1])
         # calculate the service time by summing up all the CPU activities
         service_time = sum(self.activities[0::2])
         # stats field contains performance related info about the process
@@ -18,10 +24,16 @@ class Process():
         # needed for Feedback - initially all process are put in to the highest priority queue denoted with integer value 0
         self.lastDispatchedFrom = 0
         self.execution_time_so_far = 0
+        # needed for SMP - the core the process last ran on, None until its first dispatch
+        self.lastCore = None
+        # needed for the I/O device model - the device serving the current I/O activity
+        self.ioDevice = None
+        # needed for CFS - the CPU time received so far, scaled by the weight of the process
+        self.vruntime = 0
     
     # Setters
     def setFirstCPUAccess(self, status: bool):
         self.firstCPUAccess = status
     
     def __str__(self):
-        return "Proccess " + str(self.pid) + ", Arrive " + str(self.stats.getArrivalTime()) + ": " + str(self.activities)
+        return "Proccess " + str(self.pid) + ", Arrive " + str(self.stats.getArrivalTime()) + ": " + str(list(self.activities))
@@ -1,5 +1,10 @@
 
 class ProcessStats:
+    # slots avoid a per-instance __dict__, which matters once there is one instance per simulated process
+    __slots__ = ("arrival_time", "start_time", "finish_time", "service_time",
+                 "response_count", "response_sum", "response_min", "response_max", "response_mean", "response_m2",
+                 "io_wait_time")
+
     def __init__(self, arrival_time, service_time):
         # the time the process enters the system
         self.arrival_time = arrival_time
@@ -11,8 +16,33 @@ class ProcessStats:
         self.service_time = service_time
         # response time is the is the time a processes must wait for the CPU.
         # (i.e. the time from when a processes is placed in the ready queue until the process is selected to run)
-        self.response_times = []
+        # response times are not stored, only running accumulators that are updated in O(1) per response
+        self.response_count = 0
+        self.response_sum = 0
+        self.response_min = 0
+        self.response_max = 0
+        # running mean and sum of squared differences from the mean (Welford's method) for the variance
+        self.response_mean = 0.0
+        self.response_m2 = 0.0
+        # the time the process spent waiting for an I/O device, kept apart from the response times, which only cover the CPU
+        self.io_wait_time = 0
+
+    def addResponseTime(self, response_time):
+        self.response_count += 1
+        self.response_sum += response_time
+        if self.response_count == 1:
+            self.response_min = response_time
+            self.response_max = response_time
+        else:
+            self.response_min = min(self.response_min, response_time)
+            self.response_max = max(self.response_max, response_time)
+        delta = response_time - self.response_mean
+        self.response_mean += delta / self.response_count
+        self.response_m2 += delta * (response_time - self.response_mean)
     
+    def addIOWaitTime(self, wait_time):
+        self.io_wait_time += wait_time
+
     # Getters
     def getArrivalTime(self):
         return self.arrival_time
@@ -27,11 +57,10 @@ class ProcessStats:
         return self.service_time
     
     def getTotalWaitTime(self):
-        sum = 0
-        for response_time in self.response_times:
-            sum += response_time
+        return self.response_sum
 
-        return sum
+    def getIOWaitTime(self):
+        return self.io_wait_time
     
     # the duration between the arrival time and finish time
     def getTurnaroundTime(self):
@@ -42,9 +71,23 @@ class ProcessStats:
         return self.getTurnaroundTime() / self.getServiceTime();
 
     def getAverageResponseTime(self):
-        sum = 0
-        for response_time in self.response_times:
-            sum += response_time
+        # a process that never waited for the CPU has no response times
+        if self.response_count == 0:
+            return 0
+        return self.response_sum / self.response_count;
+
+    def getResponseCount(self):
+        return self.response_count
 
-        return sum / len(self.response_times);
-    
\ No newline at end of file
+    def getMinResponseTime(self):
+        return self.response_min
+
+    def getMaxResponseTime(self):
+        return self.response_max
+
+    # sample variance of the response times
+    def getResponseTimeVariance(self):
+        if self.response_count < 2:
+            return 0.0
+        return self.response_m2 / (self.response_count - 1)
+    
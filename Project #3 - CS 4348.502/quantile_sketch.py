@@ -0,0 +1,70 @@
+# python imports
+import math
+from collections import Counter
+
+# A mergeable quantile sketch over non-negative values with a bounded relative error (DDSketch style).
+# Values are counted in logarithmically sized buckets, so memory grows with the range of the values, not with their number.
+class QuantileSketch:
+    def __init__(self, relative_accuracy = 0.01):
+        if relative_accuracy <= 0 or relative_accuracy >= 1:
+            raise ValueError("Relative accuracy must be between 0 and 1. Aborting...")
+        self.relative_accuracy = relative_accuracy
+        # every bucket covers the values in (gamma^(k-1), gamma^k]
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        # bucket index -> number of values in the bucket
+        self.buckets = {}
+        # zero cannot be placed in a logarithmic bucket, so it is counted separately
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        if value < 0:
+            raise ValueError("QuantileSketch only accepts non-negative values")
+        if value == 0:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + 1
+        self.count += 1
+
+    # Add every value of an iterable, values that repeat are placed in their bucket once
+    def addAll(self, values):
+        for value, value_count in Counter(values).items():
+            if value < 0:
+                raise ValueError("QuantileSketch only accepts non-negative values")
+            if value == 0:
+                self.zero_count += value_count
+            else:
+                key = math.ceil(math.log(value) / self.log_gamma)
+                self.buckets[key] = self.buckets.get(key, 0) + value_count
+            self.count += value_count
+
+    # Fold another sketch with the same accuracy into this one
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Only sketches with the same relative accuracy can be merged")
+        for key, bucket_count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + bucket_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    # Value at quantile q (0 <= q <= 1), within the relative accuracy of the true value
+    def quantile(self, q):
+        if q < 0 or q > 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        if self.count == 0:
+            return 0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # the point of the bucket with the same relative distance to both of its bounds
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,157 @@
+# python imports
+import heapq
+from collections import deque
+from itertools import repeat
+from operator import add, truediv
+
+# Ready queues of the schedulers. The simulator is single threaded, so unlike queue.Queue and queue.PriorityQueue
+# none of them takes a lock or notifies a condition variable on put/get.
+class ReadyQueue:
+    # to be implemented by the sub classes
+    def put(self, item):
+        pass
+
+    def get(self):
+        pass
+
+    def __len__(self):
+        pass
+
+    def empty(self):
+        return len(self) == 0
+
+    # Remove every item, in the order get would return them
+    def drain(self):
+        return [self.get() for _ in range(len(self))]
+
+# Items leave in the order they were put
+class DequeReadyQueue(ReadyQueue):
+    def __init__(self):
+        self.items = deque()
+
+    def put(self, item):
+        self.items.append(item)
+
+    def get(self):
+        return self.items.popleft()
+
+    def __len__(self):
+        return len(self.items)
+
+# The smallest item by '<' leaves first. Items are pushed and popped with heapq exactly as queue.PriorityQueue does,
+# so items that compare equal leave in the same order as they would from a PriorityQueue
+class HeapReadyQueue(ReadyQueue):
+    def __init__(self):
+        self.items = []
+
+    def put(self, item):
+        heapq.heappush(self.items, item)
+
+    def get(self):
+        return heapq.heappop(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+# Items are (item, bucket) pairs with buckets 0 to num_buckets - 1. get returns the pair that was put first into the
+# lowest numbered bucket holding an item. A bitmap with bit i set while bucket i is not empty finds that bucket without scanning the buckets
+class BucketedReadyQueue(ReadyQueue):
+    def __init__(self, num_buckets):
+        self.buckets = [deque() for _ in range(num_buckets)]
+        self.occupancy = 0
+        self.size = 0
+
+    def put(self, entry):
+        item, bucket = entry
+        self.buckets[bucket].append(item)
+        self.occupancy |= 1 << bucket
+        self.size += 1
+
+    def _take(self, bucket):
+        items = self.buckets[bucket]
+        item = items.popleft()
+        if not items:
+            self.occupancy &= ~(1 << bucket)
+        self.size -= 1
+        return item, bucket
+
+    def get(self):
+        # the lowest set bit is the lowest numbered bucket holding an item
+        return self._take((self.occupancy & -self.occupancy).bit_length() - 1)
+
+    # the pair that was put first into the highest numbered bucket holding an item
+    def getLast(self):
+        return self._take(self.occupancy.bit_length() - 1)
+
+    def __len__(self):
+        return self.size
+
+    def getNumBuckets(self):
+        return len(self.buckets)
+
+# Items are (item, key) pairs. get returns the pair with the smallest key, pairs with equal keys leave in the order they were put.
+# The pairs are kept ordered by key in a binary heap, so put and get take O(log n) however many items are waiting
+class KeyedReadyQueue(ReadyQueue):
+    def __init__(self):
+        self.heap = []
+        # put number, breaks ties between equal keys in put order
+        self.sequence = 0
+
+    def put(self, entry):
+        item, key = entry
+        heapq.heappush(self.heap, (key, self.sequence, item))
+        self.sequence += 1
+
+    def get(self):
+        key, _, item = heapq.heappop(self.heap)
+        return item, key
+
+    def __len__(self):
+        return len(self.heap)
+
+# Items have a response ratio (w + s) / s that grows with the clock, so there is no order to keep between puts.
+# Each item carries its waiting_plus_service and service_time terms, which are also kept in parallel lists so get computes every ratio in one map
+# An item with a service time of 0, such as a process whose burst estimate is 0, has an infinite ratio
+class ResponseRatioReadyQueue(ReadyQueue):
+    def __init__(self):
+        # the items in the order they were put
+        self.items = []
+        self.waiting_plus_service = []
+        self.service_times = []
+        # number of items with a service time of 0
+        self.zero_service_count = 0
+
+    def put(self, item):
+        self.items.append(item)
+        self.waiting_plus_service.append(item.waiting_plus_service)
+        self.service_times.append(item.service_time)
+        if item.service_time == 0:
+            self.zero_service_count += 1
+
+    # the item with the highest response ratio at the given time, ties go to the item put first
+    def get(self, clock):
+        if self.zero_service_count:
+            # the first item with an infinite ratio, without dividing by its service time
+            index = self.service_times.index(0)
+            self.zero_service_count -= 1
+        else:
+            # ratio = (w + s) / s for every item, computed by map so the loop runs in C
+            ratios = list(map(truediv, map(add, self.waiting_plus_service, repeat(clock)), self.service_times))
+            # index returns the first maximum
+            index = ratios.index(max(ratios))
+        self.waiting_plus_service.pop(index)
+        self.service_times.pop(index)
+        return self.items.pop(index)
+
+    def __len__(self):
+        return len(self.items)
+
+    # the order of the ratios depends on the clock, so the items are returned in the order they were put
+    def drain(self):
+        items = self.items[:]
+        # cleared in place, every core shares the lists of a global run queue
+        self.items.clear()
+        self.waiting_plus_service.clear()
+        self.service_times.clear()
+        self.zero_service_count = 0
+        return items
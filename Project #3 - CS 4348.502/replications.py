@@ -0,0 +1,208 @@
+# python imports
+import sys
+import os
+import json
+import math
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+# class imports
+from simulation import Simulation, readSchedulerFile
+
+METRICS = ("Mean Turnaround Time", "Mean Normalized Turnaround Time", "Mean Average Response Time")
+DISTRIBUTIONS = ("constant", "uniform", "exponential")
+
+# Draw one integer from a distribution of the workload spec, never less than the given minimum
+def _sample(rng, distribution, minimum):
+    kind = distribution["distribution"]
+    if kind == "constant":
+        value = distribution["value"]
+    elif kind == "uniform":
+        value = rng.randint(distribution["min"], distribution["max"])
+    elif kind == "exponential":
+        value = round(rng.expovariate(1 / distribution["mean"]))
+    else:
+        raise ValueError("Distribution {} not supported. Expected one of: {}. Aborting...".format(kind, ", ".join(DISTRIBUTIONS)))
+    return max(minimum, int(value))
+
+# Check a workload spec such as
+#   {"processes": 1000, "interarrival": {"distribution": "exponential", "mean": 12},
+#    "num_cpu_bursts": {"distribution": "uniform", "min": 1, "max": 5},
+#    "cpu_burst": {"distribution": "uniform", "min": 1, "max": 9}, "io_burst": {"distribution": "exponential", "mean": 10}}
+def checkWorkloadSpec(spec):
+    if not isinstance(spec.get("processes"), int) or spec["processes"] < 1:
+        raise ValueError("Processes must be a positive integer. Aborting...")
+    for key in ("interarrival", "num_cpu_bursts", "cpu_burst", "io_burst"):
+        if key not in spec:
+            raise ValueError("Workload spec is missing {}. Aborting...".format(key))
+        # a draw from every distribution finds unknown distributions and missing parameters
+        try:
+            _sample(random.Random(0), spec[key], 0)
+        except (KeyError, TypeError, ZeroDivisionError) as e:
+            raise ValueError("Invalid {} distribution: {!r}. Aborting...".format(key, e))
+
+# Generator yielding the (arrival time, activities) pairs of one draw of the workload spec, the same seed gives the same workload
+def generateWorkload(spec, seed):
+    rng = random.Random(seed)
+    arrival = 0
+    for _ in range(spec["processes"]):
+        arrival += _sample(rng, spec["interarrival"], 0)
+        # every activity lasts at least one time unit, a process starts and ends with a CPU burst
+        activities = [_sample(rng, spec["cpu_burst"], 1)]
+        for _ in range(_sample(rng, spec["num_cpu_bursts"], 1) - 1):
+            activities.append(_sample(rng, spec["io_burst"], 1))
+            activities.append(_sample(rng, spec["cpu_burst"], 1))
+        yield arrival, activities
+
+# Run one replication in a worker process, returns the system wide means of the run
+def _runReplication(case):
+    algorithm, options, spec, seed = case
+    simulation = Simulation.fromConfig(algorithm, options, generateWorkload(spec, seed))
+    simulation.run()
+    return simulation.getSystemStats()
+
+# Regularized incomplete beta function I_x(a, b), evaluated by its continued fraction (Numerical Recipes, betacf)
+def _incompleteBeta(a, b, x):
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    # the continued fraction converges quickly for x < (a + 1) / (a + b + 2), the symmetry relation covers the rest
+    if x > (a + 1) / (a + b + 2):
+        return 1 - _incompleteBeta(b, a, 1 - x)
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)) / a
+    tiny = 1e-300
+    c = 1.0
+    d = 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1) < 1e-12:
+            break
+    return front * h
+
+# P(T <= t) for Student's t distribution with df degrees of freedom
+def _studentTCdf(t, df):
+    tail = _incompleteBeta(df / 2, 0.5, df / (df + t * t)) / 2
+    return 1 - tail if t > 0 else tail
+
+# The t with P(T <= t) = p, found by bisection since the CDF is monotonic
+def studentTQuantile(p, df):
+    low, high = 0.0, 1.0
+    while _studentTCdf(high, df) < p:
+        high *= 2
+    for _ in range(100):
+        middle = (low + high) / 2
+        if _studentTCdf(middle, df) < p:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+# Running mean and variance of the per-run values of one metric (Welford's algorithm), the runs are merged one at a time
+class RunningMean:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        # sum of squared differences from the mean
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    # Half width of the confidence interval of the mean, infinite until there are two runs
+    def getHalfWidth(self, confidence):
+        if self.count < 2:
+            return float("inf")
+        standard_error = math.sqrt(self.m2 / (self.count - 1) / self.count)
+        return studentTQuantile((1 + confidence) / 2, self.count - 1) * standard_error
+
+# Every interval is narrower than the target, relative to its mean
+def _isPrecise(stats, confidence, target_width):
+    for metric in stats:
+        if metric.count < 2:
+            return False
+        if 2 * metric.getHalfWidth(confidence) > target_width * abs(metric.mean):
+            return False
+    return True
+
+# Run up to max_replications seeded simulations of one configuration in parallel and merge their system wide means into confidence intervals.
+# Replication i runs the workload drawn with seed + i, so every configuration sees the same workloads (common random numbers).
+# With a target width, runs stop once every interval is narrower than target_width times its mean after at least min_replications runs.
+# The results are merged in seed order, so the stopping point and the intervals do not depend on the order the workers finish in.
+def replicate(algorithm, options, spec, max_replications, target_width = None, confidence = 0.95, min_replications = 5, seed = 0, max_workers = None):
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1. Aborting...")
+    checkWorkloadSpec(spec)
+    # the simulation validates and converts the options in place, so every run gets its own copy
+    cases = ((algorithm, dict(options), spec, seed + i) for i in range(max_replications))
+    stats = [RunningMean() for _ in METRICS]
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    # keep a few runs per worker in flight instead of submitting every replication up front
+    in_flight = 2 * max_workers
+    pending = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for case in cases:
+            pending.append(executor.submit(_runReplication, case))
+            if len(pending) < in_flight:
+                continue
+            if _mergeNext(pending, stats, confidence, target_width, min_replications):
+                break
+        else:
+            while pending and not _mergeNext(pending, stats, confidence, target_width, min_replications):
+                pass
+        # the runs still in flight are not needed once the intervals are narrow enough
+        for future in pending:
+            future.cancel()
+    return [(name, metric.mean, metric.getHalfWidth(confidence), metric.count) for name, metric in zip(METRICS, stats)]
+
+# Merge the oldest pending run, returns whether the intervals are now narrow enough to stop
+def _mergeNext(pending, stats, confidence, target_width, min_replications):
+    for metric, value in zip(stats, pending.pop(0).result()):
+        metric.add(value)
+    return target_width is not None and stats[0].count >= min_replications and _isPrecise(stats, confidence, target_width)
+
+def _printIntervals(schedFile, algorithm, rows, confidence):
+    print("{} ({}), {:g}% confidence intervals over {} replications:".format(schedFile, algorithm, confidence * 100, rows[0][3]))
+    for name, mean, half_width, _ in rows:
+        print("    {}: {} +/- {} [{}, {}]".format(name, mean, half_width, mean - half_width, mean + half_width))
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded replications of a stochastic workload and report confidence intervals of the system wide means")
+    parser.add_argument("specFile", help="JSON workload spec, see checkWorkloadSpec")
+    parser.add_argument("schedFiles", nargs="+", help="scheduler files to compare, every one runs against the same seeded workloads")
+    parser.add_argument("--replications", type=int, default=100, help="largest number of replications per scheduler (default: 100)")
+    parser.add_argument("--min-replications", type=int, default=5, help="replications to run before stopping early (default: 5)")
+    parser.add_argument("--target-width", type=float, help="stop once every interval is narrower than this fraction of its mean, e.g. 0.02")
+    parser.add_argument("--confidence", type=float, default=0.95, help="confidence level of the intervals (default: 0.95)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first replication (default: 0)")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: one per CPU)")
+    args = parser.parse_args()
+    if args.replications < 2:
+        parser.error("--replications must be at least 2")
+    with open(args.specFile) as f:
+        spec = json.load(f)
+    try:
+        checkWorkloadSpec(spec)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    for schedFile in args.schedFiles:
+        algorithm, options = readSchedulerFile(schedFile)
+        rows = replicate(algorithm, options, spec, args.replications, args.target_width, args.confidence,
+                         max(2, args.min_replications), args.seed, args.workers)
+        _printIntervals(schedFile, algorithm, rows, args.confidence)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# python imports
+import sys
+import csv
+import json
+import zipfile
+from array import array
+
+OUTPUT_FORMATS = ("text", "csv", "jsonl", "npz")
+
+# columns of the per-process rows, in the order the text report prints them
+PROCESS_COLUMNS = ("pid", "arrival_time", "service_time", "start_time", "finish_time",
+                   "turnaround_time", "normalized_turnaround_time", "average_response_time")
+SYSTEM_COLUMNS = ("mean_turnaround_time", "mean_normalized_turnaround_time", "mean_average_response_time")
+# columns of the per-core rows, only written by runs with the num_cpus option
+CORE_COLUMNS = ("core", "utilization", "dispatches", "migrations", "steals")
+# columns of the per-device rows, only written by runs with the io_devices option, which also adds the I/O wait column to the process rows
+DEVICE_COLUMNS = ("device", "io_policy", "io_utilization", "io_requests", "mean_io_wait_time", "max_io_queue_length")
+IO_WAIT_COLUMN = "io_wait_time"
+
+# labels of the per-process rows in the text report, the pid column is printed as the heading of each block
+_TEXT_LABELS = ("Arrival", "Service", "Start", "Finish", "Turnaround", "Normalized Turnaround", "Average Response", "I/O Wait")
+_SYSTEM_TEXT_LABELS = ("Mean Turnaround", "Mean Normalized Turnaround", "Mean Average Response")
+_CORE_TEXT_LABELS = ("Utilization", "Dispatches", "Migrations", "Steals")
+_DEVICE_TEXT_LABELS = ("Policy", "Utilization", "Requests", "Mean I/O Wait Time", "Max Queue Length")
+# names of the core and device columns inside an .npz archive, where they share the namespace with the process columns
+# the policy names are not numeric, so they are left out of the archive
+_NPZ_CORE_NAMES = ("core_id", "core_utilization", "core_dispatches", "core_migrations", "core_steals")
+_NPZ_DEVICE_NAMES = ("device_id", None, "device_utilization", "device_requests", "device_mean_io_wait_time", "device_max_queue_length")
+
+# number of rows collected before they are handed to the output stream in one write
+_ROWS_PER_WRITE = 4096
+
+# Generator yielding one row per process, every stat getter is called once
+# with io_wait the time the process spent waiting for I/O devices is added as the last column
+def processRows(processes, io_wait = False):
+    for process in processes:
+        stats = process.stats
+        turnaround = stats.getTurnaroundTime()
+        row = (process.pid, stats.getArrivalTime(), stats.getServiceTime(), stats.getStartTime(), stats.getFinishTime(),
+               turnaround, turnaround / stats.getServiceTime(), stats.getAverageResponseTime())
+        yield row + (stats.getIOWaitTime(),) if io_wait else row
+
+# Keeps the running sums the system wide statistics are computed from while the rows stream by
+class _SystemStats:
+    def __init__(self):
+        self.count = 0
+        self.turnaroundTimeSum = 0
+        self.normTurnaroundTimeSum = 0
+        self.responseTimesSum = 0
+
+    def add(self, row):
+        self.count += 1
+        self.turnaroundTimeSum += row[5]
+        self.normTurnaroundTimeSum += row[6]
+        self.responseTimesSum += row[7]
+
+    def means(self):
+        return (self.turnaroundTimeSum/self.count, self.normTurnaroundTimeSum/self.count, self.responseTimesSum/self.count)
+
+def _percentileColumn(label):
+    # "P95 Response" -> "p95_response_time"
+    return label.lower().replace(" ", "_") + "_time"
+
+def _processColumns(devices):
+    return PROCESS_COLUMNS + (IO_WAIT_COLUMN,) if devices else PROCESS_COLUMNS
+
+def writeText(out, processes, percentiles = (), cores = (), devices = ()):
+    system = _SystemStats()
+    buffer = []
+    for row in processRows(processes, bool(devices)):
+        system.add(row)
+        buffer.append("For process {}:\n".format(row[0]))
+        for label, value in zip(_TEXT_LABELS, row[1:]):
+            buffer.append("    {} Time: {}:\n".format(label, value))
+        if len(buffer) >= _ROWS_PER_WRITE * 8:
+            out.write("".join(buffer))
+            buffer.clear()
+    # print system wide statistics
+    buffer.append("System Wide Statistics:\n")
+    for label, value in zip(_SYSTEM_TEXT_LABELS, system.means()):
+        buffer.append("    {} Time: {}:\n".format(label, value))
+    for label, value in percentiles:
+        buffer.append("    {} Time: {}:\n".format(label, value))
+    for heading, labels, rows in (("core", _CORE_TEXT_LABELS, cores), ("device", _DEVICE_TEXT_LABELS, devices)):
+        for row in rows:
+            buffer.append("For {} {}:\n".format(heading, row[0]))
+            for label, value in zip(labels, row[1:]):
+                buffer.append("    {}: {}:\n".format(label, value))
+    out.write("".join(buffer))
+
+# one row per process followed by a single "system" row holding the means in the matching columns,
+# one "core" row per core and one "device" row per I/O device
+def writeCsv(out, processes, percentiles = (), cores = (), devices = ()):
+    system = _SystemStats()
+    writer = csv.writer(out)
+    processColumns = _processColumns(devices)
+    header = ("record",) + processColumns + tuple(_percentileColumn(label) for label, _ in percentiles)
+    writer.writerow(header + (CORE_COLUMNS if cores else ()) + (DEVICE_COLUMNS if devices else ()))
+    buffer = []
+    for row in processRows(processes, bool(devices)):
+        system.add(row)
+        buffer.append(("process",) + row)
+        if len(buffer) >= _ROWS_PER_WRITE:
+            writer.writerows(buffer)
+            buffer.clear()
+    writer.writerows(buffer)
+    meanTurnaround, meanNormTurnaround, meanResponse = system.means()
+    writer.writerow(("system", "", "", "", "", "", meanTurnaround, meanNormTurnaround, meanResponse) + ("",) * (len(processColumns) - len(PROCESS_COLUMNS)) +
+                    tuple(value for _, value in percentiles))
+    # core and device rows leave every column before their own empty
+    writer.writerows(("core",) + ("",) * (len(header) - 1) + tuple(row) for row in cores)
+    padding = len(header) - 1 + (len(CORE_COLUMNS) if cores else 0)
+    writer.writerows(("device",) + ("",) * padding + tuple(row) for row in devices)
+
+# one JSON object per process followed by a single "system" object, one "core" object per core and one "device" object per I/O device
+def writeJsonLines(out, processes, percentiles = (), cores = (), devices = ()):
+    system = _SystemStats()
+    processColumns = _processColumns(devices)
+    buffer = []
+    for row in processRows(processes, bool(devices)):
+        system.add(row)
+        record = {"record": "process"}
+        record.update(zip(processColumns, row))
+        buffer.append(json.dumps(record))
+        if len(buffer) >= _ROWS_PER_WRITE:
+            buffer.append("")
+            out.write("\n".join(buffer))
+            buffer.clear()
+    record = {"record": "system"}
+    record.update(zip(SYSTEM_COLUMNS, system.means()))
+    record.update((_percentileColumn(label), value) for label, value in percentiles)
+    buffer.append(json.dumps(record))
+    for name, columns, rows in (("core", CORE_COLUMNS, cores), ("device", DEVICE_COLUMNS, devices)):
+        for row in rows:
+            record = {"record": name}
+            record.update(zip(columns, row))
+            buffer.append(json.dumps(record))
+    buffer.append("")
+    out.write("\n".join(buffer))
+
+# Serialize a one dimensional array, or a scalar when shape is (), in the .npy format
+def _npyBytes(values, shape):
+    data = values if sys.byteorder == "little" else _byteswapped(values)
+    descr = "<f8" if values.typecode == "d" else "<i8"
+    header = "{{'descr': '{}', 'fortran_order': False, 'shape': {}, }}".format(descr, shape)
+    # magic (6) + version (2) + header length (2) + header must be a multiple of 64 bytes, ending with a newline
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = header + " " * (padding % 64) + "\n"
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1") + data.tobytes()
+
+def _byteswapped(values):
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped
+
+# columnar NumPy archive: one array per process column plus one scalar per system wide statistic,
+# and one "core_" array per core column and one "device_" array per device column
+# the .npy members are written directly, so NumPy is only needed to read the file back
+def writeNpz(out, processes, percentiles = (), cores = (), devices = ()):
+    system = _SystemStats()
+    processColumns = _processColumns(devices)
+    columns = [array('q') for _ in range(5)] + [array('q'), array('d'), array('d')] + [array('q') for _ in processColumns[len(PROCESS_COLUMNS):]]
+    for row in processRows(processes, bool(devices)):
+        system.add(row)
+        for column, value in zip(columns, row):
+            column.append(value)
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, column in zip(processColumns, columns):
+            archive.writestr(name + ".npy", _npyBytes(column, "({},)".format(len(column))))
+        scalars = list(zip(SYSTEM_COLUMNS, system.means())) + [(_percentileColumn(label), value) for label, value in percentiles]
+        for name, value in scalars:
+            archive.writestr(name + ".npy", _npyBytes(array('d', [value]), "()"))
+        for names, rows in ((_NPZ_CORE_NAMES, cores), (_NPZ_DEVICE_NAMES, devices)):
+            for name, values in zip(names, zip(*rows)):
+                if name is None:
+                    continue
+                column = array('d' if isinstance(values[0], float) else 'q', values)
+                archive.writestr(name + ".npy", _npyBytes(column, "({},)".format(len(column))))
+
+_WRITERS = {"text": writeText, "csv": writeCsv, "jsonl": writeJsonLines, "npz": writeNpz}
+
+# Write the per-process rows and the system wide statistics in the requested format
+def writeResults(output_format, out, processes, percentiles = (), cores = (), devices = ()):
+    if output_format not in _WRITERS:
+        raise ValueError("Output format {} not supported. Expected one of: {}".format(output_format, ", ".join(OUTPUT_FORMATS)))
+    _WRITERS[output_format](out, processes, percentiles, cores, devices)
@@ -1,6 +1,8 @@
-import re,sys
+import re
 # class imports
 from event import Event
+from quantile_sketch import QuantileSketch
+from scheduler_profiler import SchedulerProfiler
 
 class IllegalArgumentError(ValueError):
    def __init__(self, message):
@@ -11,44 +13,106 @@ optionsRequiredByAlgorithm = {
     "VRR": {"quantum" : None},
     "SRT": {"service_given": None, "alpha": None},
     "HRRN": {"service_given": None, "alpha": None},
-    "FEEDBACK": {"quantum": None, "num_priorities": None}
+    "FEEDBACK": {"quantum": None, "num_priorities": None},
+    "CFS": {"weights": None, "min_granularity": None, "target_latency": None}
 }
 
 # Base class for scheduling algorithms
 class Scheduler():
+    # whether a process taken over from another scheduler keeps running until the end of its pending time slice, see resumeRunning
+    keepsTimeSlices = False
+
     def __init__(self, algorithm, eventQueue, options, readyQueue = None):
-        try:
-            self.isCPUIdle = True
-            self.eventQueue = eventQueue
-            self.options = options
-            # ready queue operates differently depending on the algorithm and holds process instances
-            self.readyQueue = readyQueue
-            # name of the algorithm to be used in the current run
-            self.algorithm = algorithm
-            self.current_running_process = None
-            # validate algorihm configs
-            self.__checkOptions()
-            # validate if the given set of options valid for the current algorithm used in the current run
-            if not self.__confirmAlgorithm():
-                raise IllegalArgumentError("{} cannot have invalid set of options. Aborting...".format(self.algorithm))
-        
-        except ValueError or IllegalArgumentError as e:
-            print(e)
-            sys.exit(1)
+        self.isCPUIdle = True
+        self.eventQueue = eventQueue
+        self.options = options
+        # ready queue operates differently depending on the algorithm and holds process instances
+        self.readyQueue = readyQueue
+        # name of the algorithm to be used in the current run
+        self.algorithm = algorithm
+        self.current_running_process = None
+        # distributions of every recorded response time and of the turnaround time of every finished process
+        self.responseTimeSketch = QuantileSketch()
+        self.turnaroundTimeSketch = QuantileSketch()
+        # optional event_trace.TraceRecorder the dispatch decisions are recorded to
+        self.traceRecorder = None
+        # optional timeline_recorder.TimelineRecorder the dispatches are recorded to
+        self.timelineRecorder = None
+        # number of times a process was given the CPU
+        self.dispatchCount = 0
+        # the core this scheduler runs on, only a SchedulerSMP creates schedulers for cores other than 0
+        self.coreId = 0
+        # time of the latest dispatch and number of dispatched processes that last ran on another core
+        self.lastDispatchTime = 0
+        self.migrationCount = 0
+        # event type -> handler, looked up once per event instead of comparing the type against every name
+        self.eventHandlers = self._getEventHandlers()
+        # set by enableProfiling, see scheduler_profiler.py
+        self.profiler = None
+        # set by attachIODevices, without it every I/O activity starts as soon as the process blocks
+        self.ioDevices = None
+        # validate algorihm configs
+        self.__checkOptions()
+        # validate if the given set of options valid for the current algorithm used in the current run
+        if not self.__confirmAlgorithm():
+            raise IllegalArgumentError("{} cannot have invalid set of options. Aborting...".format(self.algorithm))
+
+    def _getEventHandlers(self):
+        return {
+            "ARRIVE": self.handleArrivalEvent,
+            "BLOCK": self.handleBlockEvent,
+            "UNBLOCK": self.handleUnblockEvent,
+            "TIMEOUT": self.handleTimeoutEvent,
+            "EXIT": self.handleExitEvent
+        }
+
+    # The handlers are bound to this instance and may be wrapped by the profiler or the I/O devices, so they are rebuilt instead of pickled.
+    # Profiling, tracing and the timeline do not carry over into a restored simulation.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("eventHandlers", "handleEvent", "schedule"):
+            state.pop(name, None)
+        state["profiler"] = None
+        state["traceRecorder"] = None
+        state["timelineRecorder"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.eventHandlers = self._getEventHandlers()
+        if self.ioDevices is not None:
+            self.attachIODevices(self.ioDevices)
 
     def __checkOptions(self):
         # FSFS does not have any options
         if self.algorithm == "FCFS":
             return 
         for key in self.options:
-                if(key == "quantum" or key == "num_priorities"):
+                if(key == "quantum" and self.algorithm == "FEEDBACK" and "," in str(self.options[key])):
+                    # feedback can give every priority level its own quantum as a comma separated list
+                    values = [int(value) for value in self.options[key].split(",")]
+                    if min(values) < 0:
+                        raise ValueError("{} must have non-negative integer values. Aborting...".format(key.capitalize()))
+                    self.options[key] = values
+                elif(key == "weights"):
+                    # a comma separated list of weights, given to the processes in turn by pid
+                    values = [int(value) for value in str(self.options[key]).split(",")]
+                    if min(values) < 1:
+                        raise ValueError("{} must have positive integer values. Aborting...".format(key.capitalize()))
+                    self.options[key] = values
+                elif(key == "min_granularity" or key == "target_latency"):
+                    value = int(self.options[key])
+                    if value < 1:
+                        raise ValueError("{} must have a positive integer value. Aborting...".format(key.capitalize()))
+                    self.options[key] = value
+                elif(key == "quantum" or key == "num_priorities"):
                     value = int(self.options[key])
                     if value < 0:
                         raise ValueError("{} must have a non-negative integer value. Aborting...".format(key.capitalize()))
                     self.options[key] = value
                 elif(key == "service_given"):
                     if self.options[key] not in ("true", "false"):
-                        raise ValueError()
+                        raise ValueError("{} must be true or false. Aborting...".format(key.capitalize()))
                     value = self.options[key]
                     self.options[key] = True if value == "true" else False
                 elif(key == "alpha"):
@@ -73,18 +137,157 @@ class Scheduler():
         return True
 
     # Event handler for processing the requested event(s)
-    # This function can be overriden by classes extending this class if they need to process more number of event types than default.
+    # Classes extending this class change how an event type is processed by overriding its handle*Event method.
     def handleEvent(self, clock, event: Event):
-        # uncomment the print statement below only when debugging
-        # print(event)
-        if(event.type == "ARRIVE"):
-            self.handleArrivalEvent(clock, event)
-        elif(event.type == "BLOCK"):
-            self.handleBlockEvent(clock, event)
-        elif(event.type == "UNBLOCK"):
-            self.handleUnblockEvent(clock, event)
+        # events are recorded by the simulation when tracing is enabled, see event_trace.py
+        self.eventHandlers[event.type](clock, event)
+
+    # Count and time every event handler and schedule() call, and sample the ready queue length after every event
+    # the timed wrappers replace the handlers on this instance only, so a scheduler that is not profiled runs unchanged
+    def enableProfiling(self):
+        profiler = SchedulerProfiler(self.algorithm)
+        self.profileHandlers(profiler)
+        handleEvent = self.handleEvent
+        def profiledHandleEvent(clock, event: Event):
+            handleEvent(clock, event)
+            profiler.sampleQueueLength(self.readyQueueLength())
+        self.handleEvent = profiledHandleEvent
+        self.profiler = profiler
+        return profiler
+
+    # Replace the event handlers and schedule() of this instance with wrappers timed by the profiler
+    def profileHandlers(self, profiler):
+        for etype, handler in self.eventHandlers.items():
+            self.eventHandlers[etype] = profiler.wrap(etype, handler)
+        # the handlers call self.schedule, so the instance attribute takes the place of the method
+        self.schedule = profiler.wrap("schedule", self.schedule)
+
+    # Queue blocked processes for a limited number of I/O devices, see io_devices.py
+    def attachIODevices(self, ioDevices):
+        self.ioDevices = ioDevices
+        handleUnblockEvent = self.eventHandlers["UNBLOCK"]
+        def handleDeviceUnblockEvent(clock, event: Event):
+            # free the device before the process competes for the CPU again
+            ioDevices.complete(event.process, clock)
+            handleUnblockEvent(clock, event)
+        self.eventHandlers["UNBLOCK"] = handleDeviceUnblockEvent
+
+    # Start the I/O activity at the end of the activity list of a process that just blocked
+    def startIO(self, process, clock):
+        if self.ioDevices is None:
+            # unlimited I/O: create an unblock event right away
+            self.eventQueue.push(Event("UNBLOCK", process, clock + process.activities[-1]))
+        else:
+            self.ioDevices.request(process, clock)
+
+    # Number of processes waiting for the CPU
+    def readyQueueLength(self):
+        return len(self.readyQueue)
+
+    # Number of cores running a process and number of cores
+    def busyCoreCount(self):
+        return 0 if self.isCPUIdle else 1
+
+    def getCoreCount(self):
+        return 1
+
+    # (core id, process) of every core running a process
+    def getRunningProcesses(self):
+        return [] if self.isCPUIdle else [(self.coreId, self.current_running_process)]
+
+    # Remove a waiting process so another core can run it, the entry keeps the time the process entered the ready queue
+    def takeReadyEntry(self, clock):
+        return self.readyQueue.get()
+
+    # Add an entry taken from the ready queue of another core by takeReadyEntry
+    def putReadyEntry(self, entry):
+        self.readyQueue.put(entry)
+
+    # Use the state kept across every core from the scheduler of another core, called by SchedulerSMP
+    def shareStateWith(self, other):
+        self.setSketches(other.responseTimeSketch, other.turnaroundTimeSketch)
+
+    # Record into existing response and turnaround time sketches, so the distributions span schedulers
+    def setSketches(self, responseTimeSketch, turnaroundTimeSketch):
+        self.responseTimeSketch = responseTimeSketch
+        self.turnaroundTimeSketch = turnaroundTimeSketch
+
+    # Let every core pick from one ready queue, called by SchedulerSMP
+    def shareReadyQueueWith(self, other):
+        self.readyQueue = other.readyQueue
+
+    # Take every process away from this scheduler, used when a simulation is forked into another scheduler
+    # returns the waiting processes as (process, time entered the ready queue) pairs and the running ones as (process, pending event) pairs
+    def releaseProcesses(self, clock):
+        running = self.releaseRunning(clock)
+        return self.drainReadyQueue(), [] if running is None else [running]
+
+    # Remove every waiting process, returns (process, time entered the ready queue) pairs
+    def drainReadyQueue(self):
+        return self.readyQueue.drain()
+
+    # Take the CPU away from the running process, None when the CPU is idle. Returns the process with the CPU activity it has left
+    # at the end of its activity list, and its pending BLOCK/EXIT/TIMEOUT event, which is taken out of the event queue
+    def releaseRunning(self, clock):
+        if self.isCPUIdle:
+            return None
+        process = self.current_running_process
+        # the time left is the time until the pending event
+        event = self.eventQueue.remove(process.pid)
+        time_left = event.time - clock
+        if event.type == "TIMEOUT":
+            # the CPU activity was shortened by the quantum when the process was dispatched
+            process.activities[-1] += time_left
         else:
-            self.handleExitEvent(clock, event)
+            # the CPU activity was removed when the process was dispatched
+            process.activities.append(time_left)
+        self.isCPUIdle = True
+        return process, event
+
+    # Keep running a process released by releaseRunning of another scheduler, used when a simulation is forked, the CPU must be idle
+    # a pending BLOCK/EXIT stays as it is. A pending TIMEOUT stays when the scheduler keepsTimeSlices, otherwise the process
+    # runs its CPU activity to completion. Returns False when the process has to wait in the ready queue instead
+    def resumeRunning(self, process, event, clock):
+        if event.type == "TIMEOUT" and self.keepsTimeSlices:
+            # the CPU activity left after the time slice stays on the list
+            process.activities[-1] -= event.time - clock
+            newEvent = Event("TIMEOUT", process, event.time)
+        else:
+            duration = process.activities.pop()
+            newEvent = Event("BLOCK" if len(process.activities) > 1 else "EXIT", process, clock + duration)
+        self.eventQueue.push(newEvent)
+        self.continueRun(process, clock)
+        return True
+
+    # The CPU is running a process that was not dispatched by this scheduler, the run is not counted as a dispatch
+    def continueRun(self, process, clock):
+        self.isCPUIdle = False
+        self.current_running_process = process
+        self.lastDispatchTime = clock
+        process.lastCore = self.coreId
+
+    # Bring the bookkeeping of a process scheduled by another algorithm up to date, used when a simulation is forked
+    def adoptProcess(self, process):
+        # not every algorithm tracks the CPU time a process received, the CPU activities left give it back
+        process.execution_time_so_far = process.stats.getServiceTime() - sum(process.activities[0::2])
+
+    # Put a process released by another scheduler into the ready queue
+    def enqueue(self, process, entered_time):
+        self.readyQueue.put((process, entered_time))
+
+    # Take over the processes released by another scheduler and dispatch, used when a simulation is forked
+    # the first running process keeps the CPU, the others wait in the ready queue after the processes that were already waiting
+    def admitProcesses(self, released, running, clock):
+        for process, event in running:
+            if not (self.isCPUIdle and self.resumeRunning(process, event, clock)):
+                released.append((process, clock))
+        for process, entered_time in released:
+            self.enqueue(process, entered_time)
+        self.schedule(clock)
+
+    # Per core utilization, dispatch, migration and steal counts, single core runs report none
+    def getCoreStats(self, clock):
+        return ()
 
     # Events that are common amongst every scheduler type
     def handleArrivalEvent(self, clock, event: Event):
@@ -95,10 +298,8 @@ class Scheduler():
     def handleBlockEvent(self, clock, event: Event):
         # get the process whose CPU activity is executed for completion
         current_process = event.process
-        # get the duration of the I/O activity
-        io_duration = current_process.activities[-1]
-        # create an unblock event
-        self.eventQueue.push(Event("UNBLOCK", current_process, clock + io_duration))
+        # start the I/O activity
+        self.startIO(current_process, clock)
         # now CPU is avaiable for other activities
         self.isCPUIdle = True
         self.schedule(clock)
@@ -113,15 +314,51 @@ class Scheduler():
         # remove the comp
         self.schedule(clock)
 
+    def handleTimeoutEvent(self, clock, event: Event):
+        # get the process whose CPU activity is executed until preemption
+        current_process = event.process
+        # add the activity whose just timed out back to the ready queue along with the time entered as tuple
+        self.readyQueue.put((current_process, clock))
+        # CPU now is avaiable for other activities
+        self.isCPUIdle = True
+        self.schedule(clock)
+
     def handleExitEvent(self, clock, event: Event):
         # get the activity that just ran for completion
         current_process = event.process
         # update the finish time of the process that is ready to be terminated
-        current_process.stats.finish_time = clock 
+        self.recordFinish(current_process, clock)
 
         self.isCPUIdle = True
         self.schedule(clock)
 
+    # Record that a process is given the CPU, called by every schedule() implementation when it dispatches
+    def recordDispatch(self, process, clock):
+        self.dispatchCount += 1
+        self.current_running_process = process
+        self.lastDispatchTime = clock
+        # a process dispatched on another core than the one it last ran on has migrated
+        if process.lastCore != self.coreId:
+            if process.lastCore is not None:
+                self.migrationCount += 1
+            process.lastCore = self.coreId
+        if self.traceRecorder is not None:
+            self.traceRecorder.recordDispatch(clock, process.pid)
+        if self.timelineRecorder is not None:
+            self.timelineRecorder.recordDispatch(self.coreId, clock, process.pid)
+
+    # Record the time a dispatched process waited in the ready queue
+    def recordResponseTime(self, process, response_time):
+        # response_time is 0 means the process did not wait for CPU
+        if response_time != 0:
+            process.stats.addResponseTime(response_time)
+            self.responseTimeSketch.add(response_time)
+
+    # Record the completion of a process
+    def recordFinish(self, process, clock):
+        process.stats.finish_time = clock
+        self.turnaroundTimeSketch.add(process.stats.getTurnaroundTime())
+
     # to be implemented by the sub classes
     def schedule(self):
         pass
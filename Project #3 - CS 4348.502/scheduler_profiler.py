@@ -0,0 +1,61 @@
+# python imports
+from time import perf_counter_ns
+
+# order the handlers are listed in the summary
+_SUMMARY_ORDER = ("ARRIVE", "UNBLOCK", "TIMEOUT", "BLOCK", "EXIT", "schedule")
+
+# Counts and times the event handlers and schedule() calls of a scheduler, and keeps running stats of the ready queue length
+class SchedulerProfiler:
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+        # handler name -> [calls, total nanoseconds, longest call in nanoseconds]
+        self.timings = {}
+        self.queue_samples = 0
+        self.queue_length_sum = 0
+        self.queue_length_max = 0
+
+    # Wrap a handler so every call is counted and timed under the given name
+    def wrap(self, name, handler):
+        timing = self.timings.setdefault(name, [0, 0, 0])
+        def timed(*args):
+            start = perf_counter_ns()
+            result = handler(*args)
+            elapsed = perf_counter_ns() - start
+            timing[0] += 1
+            timing[1] += elapsed
+            if elapsed > timing[2]:
+                timing[2] = elapsed
+            return result
+        return timed
+
+    def sampleQueueLength(self, length):
+        self.queue_samples += 1
+        self.queue_length_sum += length
+        if length > self.queue_length_max:
+            self.queue_length_max = length
+
+    def getCallCount(self, name):
+        return self.timings[name][0]
+
+    def getTotalTime(self, name):
+        # in seconds
+        return self.timings[name][1] / 1e9
+
+    def getAverageQueueLength(self):
+        if self.queue_samples == 0:
+            return 0
+        return self.queue_length_sum / self.queue_samples
+
+    # Write the per handler counts and times followed by the ready queue length stats
+    # the handler times include the schedule() calls made by the handler
+    def writeSummary(self, out):
+        lines = ["Scheduler Profile ({}):\n".format(self.algorithm)]
+        lines.append("    {:<10} {:>10} {:>12} {:>10} {:>10}\n".format("Handler", "Calls", "Total ms", "Mean us", "Max us"))
+        for name in _SUMMARY_ORDER:
+            calls, total, longest = self.timings.get(name, (0, 0, 0))
+            if calls == 0:
+                continue
+            lines.append("    {:<10} {:>10} {:>12.3f} {:>10.3f} {:>10.3f}\n".format(name, calls, total / 1e6, total / calls / 1e3, longest / 1e3))
+        lines.append("    Ready Queue Length: mean {:.3f}, max {} over {} events\n".format(
+            self.getAverageQueueLength(), self.queue_length_max, self.queue_samples))
+        out.write("".join(lines))
@@ -1,147 +1,503 @@
 # python imports
+import os
 import sys
 import re
+import gzip
+import pickle
+import argparse
 from queue import Queue
 # class imports
 from process import Process
 from event import Event, EventQueue
-from algorithms import SchedulerFCFS, SchedulerHRRN, SchedulerSRT, SchedulerVRR, SchedulerFeedBack
+from algorithms import SchedulerFCFS, SchedulerHRRN, SchedulerSRT, SchedulerVRR, SchedulerFeedBack, SchedulerCFS
+from result_writer import OUTPUT_FORMATS, writeResults
+from event_trace import TraceRecorder
+from metrics_sampler import MetricsSampler
+from timeline_recorder import TIMELINE_FORMATS, TimelineRecorder
+from smp import SchedulerSMP
+from scheduler import IllegalArgumentError
+from io_devices import IOSubsystem
+from fcfs_engine import runFCFS
+from workload_file import WorkloadFileReader, isWorkloadFile
+
+# first bytes of a checkpoint file, see Simulation.checkpoint
+CHECKPOINT_MAGIC = b"SIMCKPT1"
+
+# Check the (arrival time, activities) pair of one process, where names the process in the error, such as "at line 3"
+def checkProcess(arrival_time, activities, where):
+    # Make sure there is at least one activity
+    if not isinstance(activities, (list, tuple)) or len(activities) == 0:
+        raise ValueError("Process missing activities " + where)
+    # Check to make sure there is a final CPU activity
+    if len(activities) % 2 == 0:
+        raise ValueError("Process with no final CPU activity " + where)
+    # Check to make sure the arrival time and each activity duration are non negative integers, a bool is not a duration
+    for value in (arrival_time, *activities):
+        if type(value) is not int or value < 0:
+            raise ValueError("Invalid process " + where)
+    return arrival_time, activities
+
+# The (arrival time, activities) pair of one line of a process file
+def parseProcessLine(line, lineNumber):
+    tmp = line.split()
+    where = "at line " + str(lineNumber)
+    # Make sure there enough values on the line
+    if len(tmp) < 2:
+        raise ValueError("Process missing activities and possible the arrival time " + where)
+    # Check to make sure each activity, represented by a duration is an integer, and then convert it.
+    for i in range(0,len(tmp)):
+        if not tmp[i].isdecimal():
+            raise ValueError("Invalid process " + where)
+        tmp[i] = int(tmp[i])
+    return checkProcess(tmp[0], tmp[1:], where)
+
+# Generator checking every (arrival time, activities) pair of a workload given as Python values, as the process file parser does
+def checkWorkload(workload):
+    for number, pair in enumerate(workload):
+        where = "at workload entry " + str(number)
+        if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+            raise ValueError("Invalid process " + where)
+        yield checkProcess(pair[0], pair[1], where)
+
+# Generator yielding the (arrival time, activities) pair of every line of the text of a process file
+def parseProcessText(text):
+    for lineNumber, line in enumerate(text.splitlines(), 1):
+        yield parseProcessLine(line, lineNumber)
+
+# Iterator over the (arrival time, activities) pair of every line of a process file
+# it remembers the byte offset of the next line, so a checkpointed simulation reopens the file where it stopped reading
+class ProcessFileReader:
+    def __init__(self, procFile):
+        self.procFile = os.path.abspath(procFile)
+        self.offset = 0
+        self.lineNumber = 1
+        # opened on the first read
+        self.file = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.file is None:
+            self.file = open(self.procFile, "rb")
+            self.file.seek(self.offset)
+        line = self.file.readline()
+        if not line:
+            self.file.close()
+            raise StopIteration
+        self.offset += len(line)
+        pair = parseProcessLine(line.decode(), self.lineNumber)
+        self.lineNumber += 1
+        return pair
+
+    # the open file is not part of the state, the copy reopens it at the offset
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["file"] = None
+        return state
+
+# The (arrival time, activities) pair of every process of a process file, read lazily
+# a binary workload file written by workload_file.py is memory mapped instead of parsed
+def readProcessFile(procFile):
+    if isWorkloadFile(procFile):
+        return WorkloadFileReader(procFile)
+    return ProcessFileReader(procFile)
+
+# Scheduler files hold option values as strings, so option values given as Python values are converted the same way
+# a list, such as the per level quanta of FEEDBACK, becomes a comma separated list
+def optionText(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple)):
+        return ",".join(optionText(item) for item in value)
+    return str(value)
+
+# Read the algorithm name and its options from a scheduler file
+def readSchedulerFile(schedFile):
+    with open(schedFile) as f:
+        return parseSchedulerText(f.read())
+
+# The algorithm name and its options from the text of a scheduler file
+def parseSchedulerText(text):
+    # store algorithm configs into a dict
+    options = {}
+    algorithm = None
+    lines = [line.rstrip() for line in text.splitlines()] # Read lines of the file
+    algorithm = lines[0]
+    lineNumber = 1
+    for line in lines[1:]:
+        split = re.split('\s*=\s*', line)
+        if len(split) != 2:
+            raise ValueError("Invalid Scheduler option at line " + str(lineNumber))
+        options[split[0]] = split[1]
+        lineNumber+=1
+    return algorithm, options
 
 class Simulation:
+    # run whole single core FCFS simulations on the fast path of fcfs_engine.py, turned off to compare it with the event driven run
+    useFastFCFS = True
+
     # Initialize the simulation with the scheduler file and the process file
     def __init__(self, schedFile, procFile):
+        algorithm, options = readSchedulerFile(schedFile)
+        # processes are read from the process file lazily, only when the clock reaches their arrival time
+        self._setup(algorithm, options, readProcessFile(procFile))
+
+    # Create a simulation from an algorithm name, its options and an iterable of (arrival time, activities) pairs sorted by arrival time
+    @classmethod
+    def fromConfig(cls, algorithm, options, workload):
+        simulation = cls.__new__(cls)
+        # pairs read from process and workload files are checked by their readers
+        if not isinstance(workload, (ProcessFileReader, WorkloadFileReader)):
+            workload = checkWorkload(workload)
+        # the scheduler validates and converts the options in place, so work on a copy
+        simulation._setup(algorithm, {key: optionText(value) for key, value in options.items()}, iter(workload))
+        return simulation
+
+    def _setup(self, algorithm, options, workload):
         # set initial clock value to 0
         self.clock = 0
         self.eventQueue = EventQueue()
-        self.processes = self._getProcesses(procFile)
-        # Initialize Event Queue
-        for p in self.processes:
-            self.eventQueue.push(Event("ARRIVE", p, p.stats.getArrivalTime()))
+        # processes admitted to the system so far, in pid order
+        self.processes = []
+        # iterator over the (arrival time, activities) pairs of the processes that have not arrived yet
+        self.workload = workload
+        # pid and arrival time of the latest process read from the workload
+        self.lastPid = -1
+        self.lastArrival = 0
+        self.nextArrival = self._readNextArrival()
 
-        self.scheduler = self._getScheduler(schedFile)
+        # the algorithm and options the scheduler runs with, the I/O device options stay with the simulation when it is forked
+        self.config = (algorithm, {key: value for key, value in options.items() if key not in ("io_devices", "io_policy")})
+        # the I/O device options are taken out before the scheduler validates the rest
+        self.ioDevices = self._getIODevices(options)
+        self.scheduler = self._getScheduler(algorithm, options)
+        if self.ioDevices is not None:
+            self.scheduler.attachIODevices(self.ioDevices)
+        # optional recorder every handled event is written to
+        self.traceRecorder = None
+        # optional sampler of the utilization, queue lengths and throughput over time
+        self.sampler = None
+        # optional recorder of the CPU and I/O timeline, written to timelinePath in timelineFormat at the end of the run
+        self.timeline = None
+        self.timelinePath = None
+        self.timelineFormat = None
+        # number of events handled so far
+        self.eventCount = 0
         
     def __str__(self):
         return "Simulation(" + str(self.scheduler) + ", " + str(self.processes) + ") : " + str(self.eventQueue)
 
-    def _getProcesses(self,procFile):
-        procs = []
-        with open(procFile) as f:
-            lines = [line.rstrip() for line in f] # Read lines of the file
-            lineNumber = 1
-            for p in lines:
-                tmp = re.split('\s+', p)
-                # Make sure there enough values on the line
-                if len(tmp) < 2:
-                    raise ValueError("Process missing activities and possible the arrival time at line " + str(lineNumber))
-                # Check to make sure there is a final CPU activity
-                if len(tmp) % 2 == 1:
-                    raise ValueError("Process with no final CPU activity at line " + str(lineNumber))
-                # Check to make sure each activity, represented by a duration is an integer, and then convert it.
-                for i in range(0,len(tmp)):
-                    if re.fullmatch('\d+', tmp[i]) == None:
-                        raise ValueError("Invalid process on line " + str(lineNumber))
-                    else:
-                        tmp[i] = int(tmp[i])
-                procs.append(Process(lineNumber-1,tmp[0],tmp[1:]))
-                lineNumber = lineNumber + 1
-        return procs
-
-    def _getScheduler(self, schedFile):
-        # store algorithm configs into a dict
-        options = {}
-        algorithm = None
-        with open(schedFile) as f:
-            lines = [line.rstrip() for line in f] # Read lines of the file
-            algorithm = lines[0]
-            lineNumber = 1
-            for line in lines[1:]:
-                split = re.split('\s*=\s*', line)
-                if len(split) != 2:
-                    raise ValueError("Invalid Scheduler option at line " + str(lineNumber))
-                options[split[0]] = split[1]
-                lineNumber+=1
-        
-        selected_algorithm = None
+    # The process of the next (arrival time, activities) pair of the workload, None once the workload is exhausted
+    # the workload must be sorted by arrival time so that processes can be admitted in order as the clock advances
+    def _readNextArrival(self):
+        pair = next(self.workload, None)
+        if pair is None:
+            return None
+        arrival_time, activities = pair
+        # pids are handed out in arrival order
+        pid = self.lastPid + 1
+        if arrival_time < self.lastArrival:
+            raise ValueError("Process {} arrives before the process preceding it".format(pid))
+        self.lastPid = pid
+        self.lastArrival = arrival_time
+        return Process(pid, arrival_time, activities)
+
+    # Push the ARRIVE events of every process arriving at or before the given time into the event queue
+    def _admitArrivals(self, time):
+        while self.nextArrival is not None and self.nextArrival.stats.getArrivalTime() <= time:
+            process = self.nextArrival
+            self.processes.append(process)
+            self.eventQueue.push(Event("ARRIVE", process, process.stats.getArrivalTime()))
+            self.nextArrival = self._readNextArrival()
+
+    # Time of the next event, taking the processes that are not admitted yet into account
+    def _nextEventTime(self):
+        if self.eventQueue.empty():
+            return self.nextArrival.stats.getArrivalTime()
+        if self.nextArrival is None:
+            return self.eventQueue.peek().time
+        return min(self.eventQueue.peek().time, self.nextArrival.stats.getArrivalTime())
+
+    def _getScheduler(self, algorithm, options):
+        scheduler_class = None
         # Select the approriate scheduler algorithm, create an instance of it, and return it from the function
         if algorithm == "FCFS":
-            selected_algorithm = SchedulerFCFS(algorithm, self.eventQueue, options)
+            scheduler_class = SchedulerFCFS
         elif algorithm  == "VRR":
-            selected_algorithm = SchedulerVRR(algorithm, self.eventQueue, options)
+            scheduler_class = SchedulerVRR
         elif algorithm  == "SRT":
-            selected_algorithm = SchedulerSRT(algorithm, self.eventQueue, options)
+            scheduler_class = SchedulerSRT
         elif(algorithm  == "HRRN"):
-            selected_algorithm = SchedulerHRRN(algorithm, self.eventQueue, options)
+            scheduler_class = SchedulerHRRN
         elif algorithm  == "FEEDBACK":
-            selected_algorithm = SchedulerFeedBack(algorithm, self.eventQueue, options)
+            scheduler_class = SchedulerFeedBack
+        elif algorithm  == "CFS":
+            scheduler_class = SchedulerCFS
         # default case
         else:
             raise TypeError("Scheduling Algorithm {} not supported by the system. Aborting...".format(algorithm))
-        
-        return selected_algorithm
-
-    def _printSingleStat(self, state_label, stat_value):
-        print("    {} Time: {}".format(state_label, stat_value))
-    
-    def _printStats(self):
-        stat_titles = ["Arrival", 'Service', "Start", "Finish", "Turnaround", "Normalized Turnaround", "Average Response"]
-        stat_functions_dict = { "Arrival": "getArrivalTime", 'Service': "getServiceTime",
-                                "Finish": "getFinishTime", "Turnaround": "getTurnaroundTime", 
-                                "Normalized Turnaround" : "getNormalizedTurnaroundTime", 
-                                "Average Response": "getAverageResponseTime", "Start": "getStartTime"
-                            }
-
-        # keep track of the running sums of individual stats
+
+        # with a num_cpus option every core runs its own instance of the algorithm
+        if "num_cpus" in options:
+            return SchedulerSMP(scheduler_class, algorithm, self.eventQueue, options)
+        return scheduler_class(algorithm, self.eventQueue, options)
+
+    # I/O devices for the io_devices and io_policy options, None keeps the default of unlimited parallel I/O
+    def _getIODevices(self, options):
+        if "io_devices" not in options:
+            if "io_policy" in options:
+                raise IllegalArgumentError("Io_policy requires the io_devices option. Aborting...")
+            return None
+        return IOSubsystem.fromOptions(self.eventQueue, options.pop("io_devices"), options.pop("io_policy", "fifo"))
+
+    def _printStats(self, percentiles = False, output_format = "text", out = None):
+        if out is None:
+            out = sys.stdout
+        writeResults(output_format, out, self.processes, self.getPercentiles() if percentiles else (),
+                     self.getCoreStats(), self.getDeviceStats())
+
+    # p50/p95/p99 of the response times and of the turnaround times, taken from the scheduler's quantile sketches
+    def getPercentiles(self):
+        percentiles = []
+        for label, sketch in (("Response", self.scheduler.responseTimeSketch), ("Turnaround", self.scheduler.turnaroundTimeSketch)):
+            for q in (50, 95, 99):
+                percentiles.append(("P{} {}".format(q, label), sketch.quantile(q / 100)))
+        return percentiles
+
+    # (core id, utilization, dispatches, migrations, steals) of every core, empty unless the num_cpus option is given
+    def getCoreStats(self):
+        return self.scheduler.getCoreStats(self.clock)
+
+    # (device id, policy, utilization, requests, mean wait time, max queue length) of every I/O device, empty unless the io_devices option is given
+    def getDeviceStats(self):
+        if self.ioDevices is None:
+            return ()
+        return self.ioDevices.getDeviceStats(self.clock)
+
+    # Mean turnaround, mean normalized turnaround and mean average response time over all processes
+    def getSystemStats(self):
         turnaroundTimeSum = 0
         normTurnaroundTimeSum = 0
         responseTimesSum = 0
+        for process in self.processes:
+            turnaroundTimeSum += process.stats.getTurnaroundTime()
+            normTurnaroundTimeSum += process.stats.getNormalizedTurnaroundTime()
+            responseTimesSum += process.stats.getAverageResponseTime()
+
+        num_processes = len(self.processes)
+        return turnaroundTimeSum/num_processes, normTurnaroundTimeSum/num_processes, responseTimesSum/num_processes
+
+    # Record every event and dispatch decision of the run into a binary trace file, see event_trace.py
+    # with a ring size only the last ring_size records are kept
+    def enableTrace(self, path, ring_size = None):
+        self.traceRecorder = TraceRecorder(path, ring_size)
+        self.scheduler.traceRecorder = self.traceRecorder
+
+    # Stream the CPU utilization, ready queue length, blocked processes, arrivals and completions of every window of simulated time
+    # into a binary sample file, see metrics_sampler.py
+    def enableSampler(self, path, window):
+        self.sampler = MetricsSampler(path, window, self.scheduler.getCoreCount())
+
+    # Record which process held every core and I/O device over time and export it for a Gantt chart at the end of the run,
+    # in one of TIMELINE_FORMATS, see timeline_recorder.py
+    def enableTimeline(self, path, output_format = "chrome"):
+        if output_format not in TIMELINE_FORMATS:
+            raise ValueError("Timeline format must be one of: {}".format(", ".join(TIMELINE_FORMATS)))
+        self.timeline = TimelineRecorder(self.scheduler.getCoreCount())
+        # a restored simulation may already run processes, their runs start now
+        for core, process in self.scheduler.getRunningProcesses():
+            self.timeline.recordDispatch(core, self.clock, process.pid)
+        self.timelinePath = path
+        self.timelineFormat = output_format
+        self.scheduler.timelineRecorder = self.timeline
 
-        # print individual process statistics 
-        for i in range(0, len(self.processes), 1):
-            print("For process {}:".format(i))
-            # constant time - runs 7 times regardless of the outer loop
-            for j in range(0, 7, 1):
-                # get the function name dynamically
-                get_selected_stat = getattr(self.processes[i].stats, stat_functions_dict[stat_titles[j]])
-                self._printSingleStat(stat_titles[j], get_selected_stat())
-                # update running sums of system wide statistics
-                if(stat_titles[j] == "Turnaround"):
-                    turnaroundTimeSum += get_selected_stat()
-                elif (stat_titles[j] == "Normalized Turnaround"):
-                    normTurnaroundTimeSum += get_selected_stat()
-                elif (stat_titles[j] == "Average Response"):
-                    responseTimesSum += get_selected_stat()
-                else:
-                    continue
-
-        # print system wide statistics 
-        print("System Wide Statistics:")
-        self._printSingleStat("Mean Turnaround", turnaroundTimeSum/len(self.processes))
-        self._printSingleStat("Mean Normalized Turnaround", normTurnaroundTimeSum/len(self.processes))
-        self._printSingleStat("Mean Average Response Time", responseTimesSum/len(self.processes))
-
-    def start(self):
-        while not self.eventQueue.empty():
-            # remove the next event to process from the event queue
-            nextEvent = self.eventQueue.pop()
-            self.clock = nextEvent.time
-            self.scheduler.handleEvent(self.clock, nextEvent)
-            
+    # Count and time the scheduler's event handlers, see scheduler_profiler.py
+    def enableProfiling(self):
+        return self.scheduler.enableProfiling()
+
+    # The fast FCFS path runs a fresh simulation to the end in one go, without the events the trace, sampler, timeline, profiler,
+    # I/O devices or cores would observe
+    def _canRunFastFCFS(self, until):
+        return (self.useFastFCFS and until is None and self.eventCount == 0 and type(self.scheduler) is SchedulerFCFS
+                and self.ioDevices is None and self.traceRecorder is None and self.sampler is None and self.timeline is None
+                and self.scheduler.profiler is None)
+
+    # Run the simulation until every process has exited
+    # with until, stop once every event up to that time is handled and leave the clock at until, run() again continues from there
+    def run(self, until = None):
+        if self._canRunFastFCFS(until):
+            self.clock, self.eventCount = runFCFS(self.scheduler, self.processes, self.nextArrival, self._readNextArrival)
+            self.nextArrival = None
+            return
+        while self.nextArrival is not None or not self.eventQueue.empty():
+            # advance the clock to the next event and admit the processes arriving by then
+            nextTime = self._nextEventTime()
+            if until is not None and nextTime > until:
+                self.clock = max(self.clock, until)
+                return
+            self.clock = nextTime
+            self._admitArrivals(self.clock)
+            sampler = self.sampler
+            if sampler is not None:
+                sampler.advance(self.clock)
             # process all events scheduled to occur at the same clock val
-            while not self.eventQueue.empty() and self.clock == self.eventQueue.peek():
+            while not self.eventQueue.empty() and self.clock == self.eventQueue.peek().time:
                 nextEvent = self.eventQueue.pop()
+                self.eventCount += 1
+                if self.traceRecorder is not None:
+                    self.traceRecorder.recordEvent(nextEvent)
+                if self.timeline is not None:
+                    self.timeline.recordEvent(nextEvent)
+                if sampler is not None:
+                    sampler.countEvent(nextEvent.type)
                 self.scheduler.handleEvent(self.clock, nextEvent)
+            if sampler is not None:
+                sampler.observe(self.scheduler.busyCoreCount(), self.scheduler.readyQueueLength())
+
+        if self.traceRecorder is not None:
+            self.traceRecorder.close()
+        if self.sampler is not None:
+            self.sampler.close(self.clock)
+        if self.timeline is not None:
+            self.timeline.close(self.clock)
+            self.timeline.export(self.timelinePath, self.timelineFormat)
+
+    # The trace recorder and the sampler hold an open file, a restored simulation starts without them and without the timeline
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["traceRecorder"] = None
+        state["sampler"] = None
+        state["timeline"] = None
+        return state
+
+    # Only process and workload files can be reopened where they stopped, any other workload is copied into the checkpoint
+    def _makeWorkloadPicklable(self):
+        if not isinstance(self.workload, (ProcessFileReader, WorkloadFileReader)):
+            self.workload = iter(list(self.workload))
 
+    # Save the whole state of the simulation: the clock, the event queue, every admitted process with the activities it has left,
+    # the scheduler with its ready queues and the statistics. The file is a gzip compressed pickle, see restore
+    def checkpoint(self, path):
+        self._makeWorkloadPicklable()
+        with gzip.open(path, "wb") as f:
+            f.write(CHECKPOINT_MAGIC)
+            pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+
+    # Load a simulation saved by checkpoint, run() continues it where it stopped
+    # loading a pickle can run arbitrary code, so only restore checkpoints from a trusted source
+    @classmethod
+    def restore(cls, path):
+        with gzip.open(path, "rb") as f:
+            try:
+                magic = f.read(len(CHECKPOINT_MAGIC))
+            except gzip.BadGzipFile:
+                magic = None
+            if magic != CHECKPOINT_MAGIC:
+                raise ValueError("{} is not a simulation checkpoint".format(path))
+            return pickle.load(f)
+
+    # Copy of the simulation that continues from the current clock under another scheduler, the simulation itself is unchanged
+    # so one checkpoint can be forked into several schedulers. The I/O devices carry over as they are
+    # a fork into the configuration the simulation runs with continues exactly as the simulation would, the control of the other forks
+    def fork(self, algorithm, options):
+        # option values may be Python values, as with fromConfig
+        options = {key: optionText(value) for key, value in options.items()}
+        if "io_devices" in options or "io_policy" in options:
+            raise ValueError("A fork keeps the I/O devices of the simulation, io_devices and io_policy cannot be given")
+        self._makeWorkloadPicklable()
+        simulation = pickle.loads(pickle.dumps(self, pickle.HIGHEST_PROTOCOL))
+        if (algorithm, options) != self.config:
+            simulation._switchScheduler(algorithm, options)
+        return simulation
+
+    # Hand every process over to a new scheduler. The running processes keep running with their pending events where the new
+    # scheduler allows it, see Scheduler.resumeRunning, the other ones wait in its ready queue
+    def _switchScheduler(self, algorithm, options):
+        previous = self.scheduler
+        released, running = previous.releaseProcesses(self.clock)
+        # the waiting processes are queued in the order they became ready
+        released.sort(key=lambda pair: pair[1])
+        self.config = (algorithm, dict(options))
+        self.scheduler = self._getScheduler(algorithm, options)
+        # the percentiles cover the whole run, before and after the fork
+        self.scheduler.setSketches(previous.responseTimeSketch, previous.turnaroundTimeSketch)
+        if self.ioDevices is not None:
+            self.scheduler.attachIODevices(self.ioDevices)
+        for process in self.processes:
+            self.scheduler.adoptProcess(process)
+        self.scheduler.admitProcesses(released, running, self.clock)
+
+    def start(self, percentiles = False, output_format = "text", out = None):
+        self.run()
         # print the stats of the current run
-        self._printStats()
+        self._printStats(percentiles, output_format, out)
 
 def main():
-    # check to see if the correct # of arguments are passed in to the program as input
-    num_of_args = len(sys.argv)
-    if (num_of_args) != 3:
-        raise TypeError("Invalid number of arguments given. Expected: 3, Received: {}".format(num_of_args))
-    # start the simulation by creating a new Simulation object instance
-    schedule_simulator = Simulation(sys.argv[1], sys.argv[2])
-    schedule_simulator.start()
+    parser = argparse.ArgumentParser(description="Discrete event simulation of CPU scheduling algorithms")
+    parser.add_argument("schedFile", nargs="?", help="file with the scheduling algorithm and its options")
+    parser.add_argument("procFile", nargs="?", help="file with one process per line, sorted by arrival time")
+    parser.add_argument("--percentiles", action="store_true", help="also report p50/p95/p99 response and turnaround times")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text", help="output format of the results (default: text)")
+    parser.add_argument("--output", help="file to write the results to instead of the standard output")
+    parser.add_argument("--trace", help="record every event and dispatch into this binary trace file, render it with event_trace.py")
+    parser.add_argument("--trace-ring", type=int, help="keep only the last TRACE_RING records of the trace")
+    parser.add_argument("--samples", help="stream utilization, queue length and throughput per window of simulated time into this binary file, render it with metrics_sampler.py")
+    parser.add_argument("--sample-window", type=int, default=100, help="length of a sample window in simulated time (default: 100)")
+    parser.add_argument("--timeline", help="record which process held every core and I/O device over time and write it to this file for a Gantt chart")
+    parser.add_argument("--timeline-format", choices=TIMELINE_FORMATS, default="chrome", help="format of the timeline, chrome trace JSON for chrome://tracing or Perfetto, or csv (default: chrome)")
+    parser.add_argument("--profile", action="store_true", help="count and time the scheduler's event handlers and print a summary to the standard error")
+    parser.add_argument("--checkpoint", help="save the state of the simulation to this file at the time given by --checkpoint-at, then keep running")
+    parser.add_argument("--checkpoint-at", type=int, help="clock value to save the checkpoint at")
+    parser.add_argument("--restore", help="continue the simulation saved in this checkpoint file, with a schedFile it continues under that scheduler instead")
+    args = parser.parse_args()
+    if args.restore is not None:
+        if args.procFile is not None:
+            parser.error("--restore takes the processes from the checkpoint, only a schedFile can be given")
+    elif args.procFile is None:
+        parser.error("schedFile and procFile are required unless --restore is given")
+    if (args.checkpoint is None) != (args.checkpoint_at is None):
+        parser.error("--checkpoint and --checkpoint-at must be given together")
+    if args.format == "npz" and args.output is None:
+        parser.error("--format npz requires --output")
+    if args.trace_ring is not None and args.trace is None:
+        parser.error("--trace-ring requires --trace")
+    if args.sample_window <= 0:
+        parser.error("--sample-window must be a positive integer")
+    try:
+        if args.restore is not None:
+            schedule_simulator = Simulation.restore(args.restore)
+            if args.schedFile is not None:
+                # what-if run: the rest of the checkpointed run under another scheduler
+                algorithm, options = readSchedulerFile(args.schedFile)
+                schedule_simulator = schedule_simulator.fork(algorithm, options)
+        else:
+            # start the simulation by creating a new Simulation object instance
+            schedule_simulator = Simulation(args.schedFile, args.procFile)
+    except ValueError as e:
+        # invalid scheduler options
+        print(e)
+        sys.exit(1)
+    if args.trace is not None:
+        schedule_simulator.enableTrace(args.trace, args.trace_ring)
+    if args.samples is not None:
+        schedule_simulator.enableSampler(args.samples, args.sample_window)
+    if args.timeline is not None:
+        schedule_simulator.enableTimeline(args.timeline, args.timeline_format)
+    if args.profile:
+        schedule_simulator.enableProfiling()
+    if args.checkpoint is not None:
+        schedule_simulator.run(args.checkpoint_at)
+        schedule_simulator.checkpoint(args.checkpoint)
+    if args.output is None:
+        schedule_simulator.start(args.percentiles, args.format)
+    else:
+        # csv needs newline translation turned off, npz is a binary zip archive
+        with open(args.output, "wb") if args.format == "npz" else open(args.output, "w", newline="") as out:
+            schedule_simulator.start(args.percentiles, args.format, out)
+    # the summary goes to the standard error so the results stay parseable
+    if args.profile:
+        schedule_simulator.scheduler.profiler.writeSummary(sys.stderr)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,64 @@
+# class imports
+from simulation import Simulation, readSchedulerFile, readProcessFile
+from result_writer import PROCESS_COLUMNS, SYSTEM_COLUMNS, CORE_COLUMNS, DEVICE_COLUMNS, IO_WAIT_COLUMN, processRows
+
+# In-process entry points for tools that run many simulations: the configuration and the workload are passed in memory,
+# the results come back as a SimulationResult, and an invalid configuration raises instead of exiting.
+# A scheduler option error raises ValueError (IllegalArgumentError for an option that is not allowed), an unknown algorithm raises TypeError.
+
+# Results of a finished simulation. Rows are tuples in the order of the matching *_columns attribute
+class SimulationResult:
+    def __init__(self, simulation, algorithm, percentiles = False):
+        self.algorithm = algorithm
+        # clock at the end of the run, number of events handled and number of dispatches
+        self.clock = simulation.clock
+        self.events = simulation.eventCount
+        self.dispatches = simulation.scheduler.dispatchCount
+        devices = simulation.getDeviceStats()
+        self.process_columns = PROCESS_COLUMNS + (IO_WAIT_COLUMN,) if devices else PROCESS_COLUMNS
+        self.processes = list(processRows(simulation.processes, bool(devices)))
+        self.mean_turnaround_time, self.mean_normalized_turnaround_time, self.mean_average_response_time = simulation.getSystemStats()
+        # label -> value, e.g. "P95 Response" -> p95 of the response times, empty unless percentiles are requested
+        self.percentiles = dict(simulation.getPercentiles()) if percentiles else {}
+        self.core_columns = CORE_COLUMNS
+        self.cores = list(simulation.getCoreStats())
+        self.device_columns = DEVICE_COLUMNS
+        self.devices = list(devices)
+
+    def __str__(self):
+        return "SimulationResult({}, {} processes, mean turnaround {})".format(self.algorithm, len(self.processes), self.mean_turnaround_time)
+
+    # The row of a process as a column name -> value dict
+    def getProcess(self, pid):
+        return dict(zip(self.process_columns, self.processes[pid]))
+
+    # The system wide means as a column name -> value dict
+    def getSystemStats(self):
+        return dict(zip(SYSTEM_COLUMNS, (self.mean_turnaround_time, self.mean_normalized_turnaround_time, self.mean_average_response_time)))
+
+    # Plain dicts and lists only, ready for json.dumps
+    def toDict(self):
+        return {
+            "algorithm": self.algorithm,
+            "clock": self.clock,
+            "events": self.events,
+            "dispatches": self.dispatches,
+            "processes": [dict(zip(self.process_columns, row)) for row in self.processes],
+            "system": self.getSystemStats(),
+            "percentiles": dict(self.percentiles),
+            "cores": [dict(zip(self.core_columns, row)) for row in self.cores],
+            "devices": [dict(zip(self.device_columns, row)) for row in self.devices],
+        }
+
+# Run one simulation to the end and return its results
+# options are the scheduler file options, values may be strings as in a scheduler file or Python values such as 4, 0.5, True or [1, 2, 4]
+# workload is an iterable of (arrival time, activities) pairs sorted by arrival time, e.g. [(0, [5, 10, 3]), (2, [7])]
+def simulate(algorithm, options, workload, percentiles = False):
+    simulation = Simulation.fromConfig(algorithm, options, workload)
+    simulation.run()
+    return SimulationResult(simulation, algorithm, percentiles)
+
+# Run the simulation of a scheduler file and a process file, as simulation.py does, and return its results
+def simulateFiles(schedFile, procFile, percentiles = False):
+    algorithm, options = readSchedulerFile(schedFile)
+    return simulate(algorithm, options, readProcessFile(procFile), percentiles)
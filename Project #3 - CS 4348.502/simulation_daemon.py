@@ -0,0 +1,184 @@
+# python imports
+import io
+import os
+import sys
+import json
+import stat
+import errno
+import signal
+import socket
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+# class imports
+from simulation import Simulation, parseSchedulerText, parseProcessText
+from result_writer import OUTPUT_FORMATS
+
+# npz archives are binary, every other format is sent back as text
+DAEMON_FORMATS = tuple(name for name in OUTPUT_FORMATS if name != "npz")
+# requests and responses are single lines, a workload of a few MiB still fits
+_LINE_LIMIT = 1 << 26
+
+# Protocol: newline delimited JSON over a Unix domain socket. A request is one line
+#   {"id": any, "scheduler": <text of a scheduler file>, "processes": <text of a process file>, "percentiles": false, "format": "text"}
+# where "scheduler" can be replaced by "algorithm" and "options", and "processes" by "workload", a list of [arrival time, [activities]].
+# Every request gets one response line, in the order the simulations finish, so a client can pipeline requests on one connection:
+#   {"id": any, "ok": true, "output": <the results exactly as simulation.py prints them>} or {"id": any, "ok": false, "error": <message>}
+
+# Warm a worker process up front: the imports and a first small run happen before the first request arrives
+def _warmWorker():
+    _runRequest({"scheduler": "FCFS\n", "processes": "0 1\n"})
+
+# Run one request in a worker process and return the output simulation.py would print for it
+def _runRequest(request):
+    if "scheduler" in request:
+        algorithm, options = parseSchedulerText(request["scheduler"])
+    else:
+        algorithm, options = request["algorithm"], request.get("options", {})
+    if "processes" in request:
+        workload = parseProcessText(request["processes"])
+    else:
+        workload = request["workload"]
+    output_format = request.get("format", "text")
+    if output_format not in DAEMON_FORMATS:
+        raise ValueError("Format must be one of: {}".format(", ".join(DAEMON_FORMATS)))
+    out = io.StringIO(newline="")
+    Simulation.fromConfig(algorithm, options, workload).start(bool(request.get("percentiles", False)), output_format, out)
+    return out.getvalue()
+
+# Remove the socket file a daemon that did not shut down cleanly left behind, it blocks the bind
+# a path that is not a socket, or a socket a daemon still listens on, is left alone and the address counts as in use
+def _removeStaleSocket(path):
+    if not os.path.exists(path):
+        return
+    if not stat.S_ISSOCK(os.stat(path).st_mode):
+        raise OSError(errno.EADDRINUSE, "{} exists and is not a socket".format(path))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(path)
+            return
+    raise OSError(errno.EADDRINUSE, "A daemon is already listening on {}".format(path))
+
+class SimulationDaemon:
+    def __init__(self, path, max_workers = None):
+        self.path = path
+        self.max_workers = max_workers or os.cpu_count()
+        self.executor = None
+
+    # Start the worker processes and wait until every one of them is warm
+    def _startWorkers(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        # one warm-up task per worker makes the pool start every process now instead of on the first requests
+        for future in [self.executor.submit(_warmWorker) for _ in range(self.max_workers)]:
+            future.result()
+
+    async def _respond(self, writer, lock, line):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object")
+        except ValueError as e:
+            response = {"id": None, "ok": False, "error": "Invalid request: {}".format(e)}
+        else:
+            try:
+                output = await asyncio.get_running_loop().run_in_executor(self.executor, _runRequest, request)
+                response = {"id": request.get("id"), "ok": True, "output": output}
+            except (ValueError, TypeError, KeyError) as e:
+                # invalid scheduler options, an unknown algorithm or an invalid workload
+                response = {"id": request.get("id"), "ok": False, "error": str(e)}
+            except Exception as e:
+                # a request that breaks the simulation still gets its response, the daemon keeps serving
+                response = {"id": request.get("id"), "ok": False, "error": "{}: {}".format(type(e).__name__, e)}
+        # responses of requests running concurrently must not interleave
+        async with lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def _handleConnection(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # the request is longer than the line limit, the rest of the stream cannot be split into requests
+                    writer.write(json.dumps({"id": None, "ok": False, "error": "Request too long"}).encode() + b"\n")
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(self._respond(writer, lock, line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            # the client closed its side, answer what is still running
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def serve(self):
+        # checked before the workers start, so a daemon that cannot bind fails right away
+        _removeStaleSocket(self.path)
+        self._startWorkers()
+        server = await asyncio.start_unix_server(self._handleConnection, self.path, limit=_LINE_LIMIT)
+        # SIGTERM stops the daemon the way Ctrl-C does, so the workers and the socket file are cleaned up
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+# Send requests to a running daemon and return the responses in the order of the requests
+def submit(path, requests):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(b"".join(json.dumps(request).encode() + b"\n" for request in requests))
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile("rb") as f:
+            responses = [json.loads(line) for line in f]
+    # responses arrive as the simulations finish, they are matched to the requests by id
+    byId = {response["id"]: response for response in responses}
+    return [byId[request["id"]] for request in requests]
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident simulation daemon answering requests over a Unix domain socket")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serveParser = subparsers.add_parser("serve", help="run the daemon")
+    serveParser.add_argument("socket", help="path of the Unix domain socket to listen on")
+    serveParser.add_argument("--workers", type=int, help="number of worker processes (default: one per CPU)")
+    runParser = subparsers.add_parser("run", help="run a simulation on a running daemon and print its results like simulation.py")
+    runParser.add_argument("socket", help="path of the daemon's Unix domain socket")
+    runParser.add_argument("schedFile", help="file with the scheduling algorithm and its options")
+    runParser.add_argument("procFile", help="file with one process per line, sorted by arrival time")
+    runParser.add_argument("--percentiles", action="store_true", help="also report p50/p95/p99 response and turnaround times")
+    runParser.add_argument("--format", choices=DAEMON_FORMATS, default="text", help="output format of the results (default: text)")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(SimulationDaemon(args.socket, args.workers).serve())
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+        except OSError as e:
+            # the socket path is in use
+            print(e)
+            sys.exit(1)
+        return
+    with open(args.schedFile) as f:
+        scheduler = f.read()
+    with open(args.procFile) as f:
+        processes = f.read()
+    response = submit(args.socket, [{"id": 0, "scheduler": scheduler, "processes": processes,
+                                     "percentiles": args.percentiles, "format": args.format}])[0]
+    if not response["ok"]:
+        print(response["error"])
+        sys.exit(1)
+    sys.stdout.write(response["output"])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# class imports
+from event import Event
+from scheduler import IllegalArgumentError
+from scheduler_profiler import SchedulerProfiler
+
+# values of the run_queue and load_balance options, SchedulerSMP takes them and num_cpus out before the algorithm validates the rest
+RUN_QUEUES = ("per_core", "global")
+LOAD_BALANCES = ("steal", "push")
+# algorithms whose cores can share a single ready queue
+_GLOBAL_QUEUE_ALGORITHMS = ("SRT", "HRRN")
+# events that end the run of a process on its core
+_RELEASE_EVENTS = ("BLOCK", "TIMEOUT", "EXIT")
+
+# Runs one instance of a scheduling algorithm per core. All cores share the event queue and the statistics.
+# run_queue = per_core: every core has its own ready queue, new processes go to the least loaded core and
+#   load_balance = steal: unblocked processes return to the core they last ran on and an idle core steals from the busiest one
+#   load_balance = push: unblocked processes also go to the least loaded core, cores never steal
+# run_queue = global (SRT and HRRN only): every core picks from one ready queue
+class SchedulerSMP:
+    def __init__(self, scheduler_class, algorithm, eventQueue, options):
+        num_cpus = int(options.pop("num_cpus"))
+        if num_cpus < 1:
+            raise ValueError("Num_cpus must be a positive integer. Aborting...")
+        run_queue = options.pop("run_queue", "per_core")
+        if run_queue not in RUN_QUEUES:
+            raise ValueError("Run_queue must be one of: {}. Aborting...".format(", ".join(RUN_QUEUES)))
+        if run_queue == "global" and algorithm not in _GLOBAL_QUEUE_ALGORITHMS:
+            raise IllegalArgumentError("{} cannot use a global run queue, every core has its own. Aborting...".format(algorithm))
+        load_balance = options.pop("load_balance", "steal")
+        if load_balance not in LOAD_BALANCES:
+            raise ValueError("Load_balance must be one of: {}. Aborting...".format(", ".join(LOAD_BALANCES)))
+
+        self.algorithm = algorithm
+        self.eventQueue = eventQueue
+        self.globalQueue = run_queue == "global"
+        self.stealing = not self.globalQueue and load_balance == "steal"
+        # every core validates its own copy of the algorithm options
+        self.cores = [scheduler_class(algorithm, eventQueue, dict(options)) for _ in range(num_cpus)]
+        for coreId, core in enumerate(self.cores):
+            core.coreId = coreId
+            core.shareStateWith(self.cores[0])
+            if self.globalQueue:
+                core.shareReadyQueueWith(self.cores[0])
+        self.responseTimeSketch = self.cores[0].responseTimeSketch
+        self.turnaroundTimeSketch = self.cores[0].turnaroundTimeSketch
+        # time every core spent running a process and number of processes every core took from another one
+        self.busyTimes = [0] * num_cpus
+        self.stealCounts = [0] * num_cpus
+        self.profiler = None
+
+    def __str__(self):
+        return "SchedulerSMP({}, {} cores)".format(self.algorithm, len(self.cores))
+
+    @property
+    def traceRecorder(self):
+        return self.cores[0].traceRecorder
+
+    @traceRecorder.setter
+    def traceRecorder(self, recorder):
+        for core in self.cores:
+            core.traceRecorder = recorder
+
+    @property
+    def timelineRecorder(self):
+        return self.cores[0].timelineRecorder
+
+    @timelineRecorder.setter
+    def timelineRecorder(self, recorder):
+        for core in self.cores:
+            core.timelineRecorder = recorder
+
+    @property
+    def dispatchCount(self):
+        return sum(core.dispatchCount for core in self.cores)
+
+    # see Scheduler.__getstate__, the cores rebuild their own handlers
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("handleEvent", None)
+        state["profiler"] = None
+        return state
+
+    def handleEvent(self, clock, event: Event):
+        etype = event.type
+        process = event.process
+        if etype in _RELEASE_EVENTS:
+            # the process is running, so the event belongs to its core
+            core = self.cores[process.lastCore]
+            self.busyTimes[core.coreId] += clock - core.lastDispatchTime
+        elif self.globalQueue:
+            core = self._getGlobalQueueCore(clock)
+        elif etype == "UNBLOCK" and self.stealing:
+            core = self.cores[process.lastCore]
+        else:
+            core = self._getLeastLoadedCore()
+        core.handleEvent(clock, event)
+        if self.stealing:
+            # an event adds at most one waiting process, so one steal keeps any core from idling while another has work
+            if core.isCPUIdle:
+                # the core has nothing left to run
+                self._steal(core, max(self.cores, key=lambda other: other.readyQueueLength()), clock)
+            elif etype == "UNBLOCK":
+                # the process returned to its busy core, an idle core can run it now
+                for thief in self.cores:
+                    if thief.isCPUIdle:
+                        self._steal(thief, core, clock)
+                        break
+
+    # Core with the fewest processes waiting or running, ties go to the lowest core id
+    def _getLeastLoadedCore(self):
+        return min(self.cores, key=lambda core: core.readyQueueLength() + (not core.isCPUIdle))
+
+    # Core that handles a process becoming ready when every core picks from the same queue
+    def _getGlobalQueueCore(self, clock):
+        for core in self.cores:
+            if core.isCPUIdle:
+                return core
+        # SRT compares the ready process with the running one, so offer it to the core whose process has the most time left
+        if self.algorithm == "SRT":
+            return max(self.cores, key=lambda core: core.getRunningRemainingTime(clock))
+        return self.cores[0]
+
+    # Move a waiting process of the victim core to the idle thief core and run it there
+    def _steal(self, thief, victim, clock):
+        if victim.readyQueueLength() == 0:
+            return
+        thief.putReadyEntry(victim.takeReadyEntry(clock))
+        self.stealCounts[thief.coreId] += 1
+        thief.schedule(clock)
+
+    def busyCoreCount(self):
+        return sum(not core.isCPUIdle for core in self.cores)
+
+    def getCoreCount(self):
+        return len(self.cores)
+
+    def getRunningProcesses(self):
+        return [running for core in self.cores for running in core.getRunningProcesses()]
+
+    def readyQueueLength(self):
+        if self.globalQueue:
+            return self.cores[0].readyQueueLength()
+        return sum(core.readyQueueLength() for core in self.cores)
+
+    def setSketches(self, responseTimeSketch, turnaroundTimeSketch):
+        for core in self.cores:
+            core.setSketches(responseTimeSketch, turnaroundTimeSketch)
+        self.responseTimeSketch = responseTimeSketch
+        self.turnaroundTimeSketch = turnaroundTimeSketch
+
+    # Take every process away from every core, see Scheduler.releaseProcesses
+    def releaseProcesses(self, clock):
+        released = []
+        running = []
+        for core in self.cores:
+            if not core.isCPUIdle:
+                # the run of the released process ends now on this scheduler
+                self.busyTimes[core.coreId] += clock - core.lastDispatchTime
+            waiting, core_running = core.releaseProcesses(clock)
+            released.extend(waiting)
+            running.extend(core_running)
+        return released, running
+
+    def adoptProcess(self, process):
+        self.cores[0].adoptProcess(process)
+        # a process that last ran on a core this scheduler does not have returns to one it has
+        if process.lastCore is not None:
+            process.lastCore %= len(self.cores)
+
+    # Spread processes released by another scheduler over the cores and dispatch on every core
+    # a running process keeps running on its core, or on an idle core when this scheduler does not have that one, see Scheduler.resumeRunning
+    def admitProcesses(self, released, running, clock):
+        for process, event in running:
+            core = self.cores[process.lastCore]
+            if not core.isCPUIdle:
+                core = next((other for other in self.cores if other.isCPUIdle), None)
+            if core is None or not core.resumeRunning(process, event, clock):
+                released.append((process, clock))
+        for process, entered_time in released:
+            core = self.cores[0] if self.globalQueue else self._getLeastLoadedCore()
+            core.enqueue(process, entered_time)
+        for core in self.cores:
+            core.schedule(clock)
+
+    # Every core queues its blocked processes for the same I/O devices
+    def attachIODevices(self, ioDevices):
+        for core in self.cores:
+            core.attachIODevices(ioDevices)
+
+    # Count and time the event handlers of every core together, see Scheduler.enableProfiling
+    def enableProfiling(self):
+        profiler = SchedulerProfiler(self.algorithm)
+        for core in self.cores:
+            core.profileHandlers(profiler)
+        handleEvent = self.handleEvent
+        def profiledHandleEvent(clock, event: Event):
+            handleEvent(clock, event)
+            profiler.sampleQueueLength(self.readyQueueLength())
+        self.handleEvent = profiledHandleEvent
+        self.profiler = profiler
+        return profiler
+
+    # (core id, utilization, dispatches, migrations, steals) of every core, utilization is relative to the end of the run
+    def getCoreStats(self, clock):
+        stats = []
+        for core in self.cores:
+            utilization = self.busyTimes[core.coreId] / clock if clock else 0.0
+            stats.append((core.coreId, utilization, core.dispatchCount, core.migrationCount, self.stealCounts[core.coreId]))
+        return stats
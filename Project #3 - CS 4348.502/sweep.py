@@ -0,0 +1,68 @@
+# python imports
+import sys
+import os
+import json
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+# class imports
+from simulation import Simulation, readProcessFile, optionText
+
+# workload shared by every run of a worker process, set once when the worker starts
+_workload = None
+
+def _initWorker(workload):
+    global _workload
+    _workload = workload
+
+# Expand a grid such as {"VRR": {"quantum": [1, 2, 4]}} into one (algorithm, options) pair per combination
+def expandGrid(grid):
+    configs = []
+    for algorithm, axes in grid.items():
+        keys = list(axes.keys())
+        # a single value is treated as a grid axis of length one
+        values = [axes[key] if isinstance(axes[key], list) else [axes[key]] for key in keys]
+        for combination in product(*values):
+            configs.append((algorithm, {key: optionText(value) for key, value in zip(keys, combination)}))
+    return configs
+
+# Run a single configuration against the worker's workload, every run builds its own Process instances
+def _runConfig(config):
+    algorithm, options = config
+    simulation = Simulation.fromConfig(algorithm, options, _workload)
+    simulation.run()
+    meanTurnaround, meanNormTurnaround, meanResponse = simulation.getSystemStats()
+    return algorithm, options, meanTurnaround, meanNormTurnaround, meanResponse
+
+# Run every configuration of the grid against the workload in parallel and return one row per configuration
+def sweep(procFile, grid, max_workers = None):
+    # parse the workload once, the workers only receive the parsed (arrival time, activities) pairs
+    workload = list(readProcessFile(procFile))
+    configs = expandGrid(grid)
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_initWorker, initargs=(workload,)) as executor:
+        # map keeps the rows in the order of the grid
+        return list(executor.map(_runConfig, configs))
+
+def _printTable(rows):
+    headers = ["Algorithm", "Options", "Mean Turnaround", "Mean Normalized Turnaround", "Mean Average Response"]
+    lines = [headers]
+    for algorithm, options, meanTurnaround, meanNormTurnaround, meanResponse in rows:
+        optionsLabel = " ".join("{}={}".format(key, value) for key, value in options.items())
+        lines.append([algorithm, optionsLabel, str(meanTurnaround), str(meanNormTurnaround), str(meanResponse)])
+    widths = [max(len(line[i]) for line in lines) for i in range(len(headers))]
+    for line in lines:
+        print("  ".join(column.ljust(width) for column, width in zip(line, widths)).rstrip())
+
+def main():
+    # check to see if the correct # of arguments are passed in to the program as input
+    num_of_args = len(sys.argv)
+    if (num_of_args) != 3:
+        raise TypeError("Invalid number of arguments given. Expected: 3, Received: {}".format(num_of_args))
+    # the grid file maps algorithm names to their option axes, e.g. {"FCFS": {}, "VRR": {"quantum": [1, 2, 4]}}
+    with open(sys.argv[1]) as f:
+        grid = json.load(f)
+    _printTable(sweep(sys.argv[2], grid))
+
+if __name__ == "__main__":
+    main()
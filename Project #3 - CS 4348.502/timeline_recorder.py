@@ -0,0 +1,153 @@
+# python imports
+import json
+from array import array
+
+TIMELINE_FORMATS = ("chrome", "csv")
+TIMELINE_COLUMNS = ("resource", "lane", "pid", "start", "end")
+# events that end the run of a process on its core
+_RELEASE_EVENTS = ("BLOCK", "TIMEOUT", "EXIT")
+# lane of an I/O interval under unlimited I/O, where every blocked process has its own
+_UNLIMITED_IO = -1
+# number of rows or trace events collected before they are written
+_FLUSH_ITEMS = 4096
+
+# One column array per field of an interval, an interval costs 22 bytes instead of a tuple of objects
+class _Intervals:
+    def __init__(self):
+        self.lanes = array('i')
+        self.pids = array('I')
+        self.starts = array('Q')
+        self.ends = array('Q')
+
+    def __len__(self):
+        return len(self.pids)
+
+    def append(self, lane, pid, start, end):
+        self.lanes.append(lane)
+        self.pids.append(pid)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    # (lane, pid, start, end) of every interval in the order they ended
+    def __iter__(self):
+        return zip(self.lanes, self.pids, self.starts, self.ends)
+
+# Records which process held every CPU core and every I/O device over time, as intervals run-length encoded per lane:
+# a core keeps one open (pid, start) run that a dispatch of another process or the end of the CPU activity closes, and a run
+# that continues the previous interval of its core with the same process (a process dispatched again right after its timeout)
+# extends that interval. Memory grows with the number of context switches and I/O activities, not with the simulated time.
+# Dispatches come from Scheduler.recordDispatch, the end of CPU and I/O activities from the events handled by the simulation.
+class TimelineRecorder:
+    def __init__(self, num_cpus = 1):
+        self.num_cpus = num_cpus
+        self.cpu = _Intervals()
+        self.io = _Intervals()
+        # the open run of every core as [pid, start], None while the core is idle
+        self.running = [None] * num_cpus
+        # index of the latest closed interval of every core, -1 before the first one
+        self.lastInterval = [-1] * num_cpus
+
+    def _closeRun(self, core, time):
+        pid, start = self.running[core]
+        self.running[core] = None
+        # a zero length CPU activity never held the core
+        if time == start:
+            return
+        cpu = self.cpu
+        last = self.lastInterval[core]
+        if last >= 0 and cpu.pids[last] == pid and cpu.ends[last] == start:
+            cpu.ends[last] = time
+        else:
+            cpu.append(core, pid, start, time)
+            self.lastInterval[core] = len(cpu) - 1
+
+    # A process is given the CPU of a core, called by every schedule() implementation through Scheduler.recordDispatch
+    def recordDispatch(self, core, time, pid):
+        if self.running[core] is not None:
+            # the running process was preempted
+            self._closeRun(core, time)
+        self.running[core] = [pid, time]
+
+    # An event about to be handled, called by the simulation before the scheduler handles it
+    def recordEvent(self, event):
+        etype = event.type
+        process = event.process
+        if etype in _RELEASE_EVENTS:
+            # the process is running, so it runs on the core it was last dispatched to
+            run = self.running[process.lastCore]
+            if run is not None and run[0] == process.pid:
+                self._closeRun(process.lastCore, event.time)
+        elif etype == "UNBLOCK":
+            # the I/O activity is still at the end of the activity list, it was served right up to this event
+            duration = process.activities[-1]
+            if duration != 0:
+                lane = _UNLIMITED_IO if process.ioDevice is None else process.ioDevice
+                self.io.append(lane, process.pid, event.time - duration, event.time)
+
+    # Close the runs still open at the end of the run, called before exporting a simulation stopped early
+    def close(self, time):
+        for core in range(self.num_cpus):
+            if self.running[core] is not None:
+                self._closeRun(core, time)
+
+    # Number of intervals recorded so far
+    def __len__(self):
+        return len(self.cpu) + len(self.io)
+
+    # Generator yielding (resource, lane, pid, start, end) of every CPU interval then every I/O interval, in the order of TIMELINE_COLUMNS
+    # lane is the core or the I/O device, None for I/O under unlimited I/O
+    def getIntervals(self):
+        for core, pid, start, end in self.cpu:
+            yield "cpu", core, pid, start, end
+        for device, pid, start, end in self.io:
+            yield "io", None if device == _UNLIMITED_IO else device, pid, start, end
+
+    # Write the intervals as CSV, one row per interval
+    def writeCSV(self, out):
+        lines = [",".join(TIMELINE_COLUMNS) + "\n"]
+        for resource, lane, pid, start, end in self.getIntervals():
+            lines.append("{},{},{},{},{}\n".format(resource, "" if lane is None else lane, pid, start, end))
+            if len(lines) >= _FLUSH_ITEMS:
+                out.write("".join(lines))
+                lines.clear()
+        out.write("".join(lines))
+
+    # Write the intervals in the Chrome trace event format, for chrome://tracing or Perfetto, one unit of simulated time is shown as 1 us
+    # the CPU is trace process 0 with one thread per core, I/O is trace process 1 with one thread per device, or per process under unlimited I/O
+    def writeChromeTrace(self, out):
+        events = [{"name": "process_name", "ph": "M", "pid": 0, "args": {"name": "CPU"}},
+                  {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "I/O"}}]
+        for core in range(self.num_cpus):
+            events.append({"name": "thread_name", "ph": "M", "pid": 0, "tid": core, "args": {"name": "Core {}".format(core)}})
+        lanes = set()
+        for device, pid, _, _ in self.io:
+            lanes.add((device, pid) if device == _UNLIMITED_IO else (device, None))
+        for device, pid in sorted(lanes):
+            name = "Process {}".format(pid) if device == _UNLIMITED_IO else "Device {}".format(device)
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": pid if device == _UNLIMITED_IO else device, "args": {"name": name}})
+        out.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        out.write(",\n".join(json.dumps(event) for event in events))
+        # the interval events are formatted directly, they are the bulk of the file
+        lines = []
+        for resource, lane, pid, start, end in self.getIntervals():
+            if resource == "cpu":
+                tracePid, tid = 0, lane
+            else:
+                tracePid, tid = 1, pid if lane is None else lane
+            lines.append(',\n{{"name": "Process {}", "cat": "{}", "ph": "X", "ts": {}, "dur": {}, "pid": {}, "tid": {}}}'.format(
+                pid, resource, start, end - start, tracePid, tid))
+            if len(lines) >= _FLUSH_ITEMS:
+                out.write("".join(lines))
+                lines.clear()
+        out.write("".join(lines))
+        out.write("\n]}\n")
+
+    # Write the intervals to a file in one of TIMELINE_FORMATS
+    def export(self, path, output_format = "chrome"):
+        if output_format not in TIMELINE_FORMATS:
+            raise ValueError("Timeline format must be one of: {}".format(", ".join(TIMELINE_FORMATS)))
+        with open(path, "w", newline="") as out:
+            if output_format == "csv":
+                self.writeCSV(out)
+            else:
+                self.writeChromeTrace(out)
@@ -0,0 +1,151 @@
+# python imports
+import os
+import sys
+import mmap
+import struct
+from array import array
+
+# file header: magic, format version, number of processes and number of activities
+# the header is followed by the process table, one row of four uint64 per process: (pid, arrival time, activity offset, activity count),
+# and by one flat uint32 array of every activity of every process, in process order
+WORKLOAD_MAGIC = b"SCHWKLD1"
+_VERSION = 1
+_HEADER = struct.Struct("<8sH6xQQ")
+_ROW_FIELDS = 4
+# size of the buffers collected before they are written to the file
+_FLUSH_ITEMS = 1 << 16
+# activities are stored as uint32
+_MAX_ACTIVITY = (1 << 32) - 1
+
+# Whether the file is a binary workload file, otherwise it is read as a text process file
+def isWorkloadFile(path):
+    with open(path, "rb") as f:
+        return f.read(len(WORKLOAD_MAGIC)) == WORKLOAD_MAGIC
+
+# Write (arrival time, activities) pairs sorted by arrival time into a binary workload file
+# the pairs are validated the way a process file is, then streamed through two temporary part files that are joined at the end
+def writeWorkloadFile(path, workload):
+    table_path = path + ".table"
+    activities_path = path + ".activities"
+    num_processes = 0
+    num_activities = 0
+    lastArrival = 0
+    try:
+        with open(table_path, "wb") as table_file, open(activities_path, "wb") as activities_file:
+            rows = array('Q')
+            activities = array('I')
+            for pid, (arrival_time, process_activities) in enumerate(workload):
+                if len(process_activities) % 2 == 0:
+                    raise ValueError("Process {} has no final CPU activity".format(pid))
+                if arrival_time < lastArrival:
+                    raise ValueError("Process {} arrives before the process preceding it".format(pid))
+                if process_activities and max(process_activities) > _MAX_ACTIVITY:
+                    raise ValueError("Process {} has an activity longer than {}, the longest a workload file can hold".format(pid, _MAX_ACTIVITY))
+                lastArrival = arrival_time
+                rows.extend((pid, arrival_time, num_activities, len(process_activities)))
+                activities.extend(process_activities)
+                num_processes += 1
+                num_activities += len(process_activities)
+                if len(activities) >= _FLUSH_ITEMS:
+                    rows.tofile(table_file)
+                    activities.tofile(activities_file)
+                    del rows[:]
+                    del activities[:]
+            rows.tofile(table_file)
+            activities.tofile(activities_file)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(WORKLOAD_MAGIC, _VERSION, num_processes, num_activities))
+            for part in (table_path, activities_path):
+                with open(part, "rb") as partFile:
+                    while True:
+                        chunk = partFile.read(1 << 20)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+    finally:
+        # the part files are removed whether the workload was written or rejected
+        for part in (table_path, activities_path):
+            if os.path.exists(part):
+                os.remove(part)
+
+# Iterator over the (arrival time, activities) pairs of a binary workload file, which is memory mapped instead of read:
+# opening it only checks the header, and the activities of a process are a memoryview into the mapping, so nothing is parsed or copied
+# until a process is created from them. Like ProcessFileReader, it remembers the next process so a checkpoint can reopen the file there.
+class WorkloadFileReader:
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.index = 0
+        # mapped on the first read
+        self.map = None
+        self.num_processes = None
+
+    def _open(self):
+        with open(self.path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < _HEADER.size:
+            raise ValueError("{} is not a workload file".format(self.path))
+        magic, version, num_processes, num_activities = _HEADER.unpack_from(self.map)
+        if magic != WORKLOAD_MAGIC or version != _VERSION:
+            raise ValueError("{} is not a version {} workload file".format(self.path, _VERSION))
+        table_end = _HEADER.size + 8 * _ROW_FIELDS * num_processes
+        if len(self.map) != table_end + 4 * num_activities:
+            raise ValueError("{} is truncated".format(self.path))
+        view = memoryview(self.map)
+        # the header is 32 bytes, so both arrays start aligned to their item size
+        self.rows = view[_HEADER.size:table_end].cast('Q')
+        self.activities = view[table_end:].cast('I')
+        self.num_processes = num_processes
+
+    def __iter__(self):
+        return self
+
+    def __len__(self):
+        if self.map is None:
+            self._open()
+        return self.num_processes
+
+    def __next__(self):
+        if self.map is None:
+            self._open()
+        if self.index >= self.num_processes:
+            raise StopIteration
+        row = _ROW_FIELDS * self.index
+        rows = self.rows
+        offset = rows[row + 2]
+        self.index += 1
+        return rows[row + 1], self.activities[offset:offset + rows[row + 3]]
+
+    # the mapping is not part of the state, the copy maps the file again
+    def __getstate__(self):
+        return {"path": self.path, "index": self.index, "map": None, "num_processes": None}
+
+# Convert a text process file into a binary workload file
+def convertToWorkloadFile(procFile, path):
+    # imported here, simulation.py reads workload files through this module
+    from simulation import ProcessFileReader
+    writeWorkloadFile(path, ProcessFileReader(procFile))
+
+# Convert a binary workload file back into a text process file, one process per line
+def convertToProcessFile(path, procFile):
+    with open(procFile, "w") as f:
+        lines = []
+        for arrival_time, activities in WorkloadFileReader(path):
+            lines.append(" ".join(map(str, (arrival_time, *activities))) + "\n")
+            if len(lines) >= 4096:
+                f.write("".join(lines))
+                lines.clear()
+        f.write("".join(lines))
+
+def main():
+    # check to see if the correct # of arguments are passed in to the program as input
+    num_of_args = len(sys.argv)
+    if (num_of_args) != 3:
+        raise TypeError("Invalid number of arguments given. Expected: 3, Received: {}".format(num_of_args))
+    # the direction follows the input: a process file becomes a workload file and a workload file becomes a process file
+    if isWorkloadFile(sys.argv[1]):
+        convertToProcessFile(sys.argv[1], sys.argv[2])
+    else:
+        convertToWorkloadFile(sys.argv[1], sys.argv[2])
+
+if __name__ == "__main__":
+    main()